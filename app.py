@@ -295,6 +295,8 @@ def main():
             reload=True,
             reload_dirs=["src", "templates"],  # 감시할 디렉토리 명시
             log_level=log_level,
+            backlog=settings.server_backlog,
+            timeout_keep_alive=settings.server_timeout_keep_alive,  # 브라우저 폴링 요청의 연결 재사용
             access_log=args.debug,  # 디버그 모드에서만 access 로그 활성화
             log_config=log_config  # 커스텀 로그 설정 사용
         )
@@ -73,9 +73,8 @@ def test_chroma_config():
             client = chromadb.HttpClient(
                 host=config["host"],
                 port=config["port"],
-                username=config["username"],
-                password=config["password"],
-                ssl=config["ssl"]
+                ssl=config["ssl"],
+                settings=chromadb.config.Settings(**config["settings"])
             )
             print("✅ HTTP Chroma DB 연결 성공")
         
@@ -8,13 +8,14 @@ import shutil
 from typing import List, Optional, Dict, Any
 from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 import logging
 from datetime import datetime
 import threading
 import asyncio
 
-from src.services.document_service import document_service
+from src.services.document_service import get_document_service
 from src.services.rag_service import rag_service
 from src.config.settings import settings
 
@@ -26,6 +27,8 @@ router = APIRouter()
 UPLOAD_DIR = "static/RAG"
 # .doc는 명시적으로 차단하고 .docx만 허용
 ALLOWED_EXTENSIONS = {'.txt', '.pdf', '.docx', '.md', '.json', '.csv', '.xlsx', '.xls'}
+# 업로드 파일 저장 시 한 번에 복사할 버퍼 크기 (1MB)
+UPLOAD_COPY_BUFFER_SIZE = 1024 * 1024
 
 class DocumentInfo(BaseModel):
     filename: str
@@ -163,9 +166,9 @@ async def upload_document(file: UploadFile = File(...)):
             file_path = os.path.join(UPLOAD_DIR, filename)
             counter += 1
         
-        # 파일 저장
+        # 파일 저장 - 1MB 단위 스트리밍 복사를 스레드 풀에서 수행해 이벤트 루프를 막지 않음
         with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+            await run_in_threadpool(shutil.copyfileobj, file.file, buffer, UPLOAD_COPY_BUFFER_SIZE)
         
         logger.info(f"문서 업로드 완료: {filename} (크기: {file.size} bytes)")
         
@@ -184,7 +187,7 @@ async def upload_document(file: UploadFile = File(...)):
                 from src.api.endpoints.word_embedding import get_word_embedding_service
                 service = get_word_embedding_service()
                 # Word 전용 서비스는 임시 파일 기반 처리이므로 그대로 경로 전달
-                result = service.process_word_document(file_path, {
+                result = await run_in_threadpool(service.process_word_document, file_path, {
                     "source": "upload",
                     "upload_time": datetime.now().isoformat(),
                     "file_size": file.size,
@@ -219,7 +222,8 @@ async def upload_document(file: UploadFile = File(...)):
                     }
                 )
 
-            content = document_service.load_document(file_path)
+            # PDF/엑셀 파싱은 CPU/디스크 작업이므로 스레드 풀에서 실행
+            content = await run_in_threadpool(get_document_service().load_document, file_path)
             
             if not content.strip():
                 raise ValueError("문서에서 텍스트를 추출할 수 없습니다.")
@@ -279,7 +283,7 @@ async def upload_document(file: UploadFile = File(...)):
                 except Exception as e:
                     logger.error(f"처리 완료 콜백 처리 중 오류: {e}")
 
-            doc_id = document_service.process_document(
+            doc_id = get_document_service().process_document(
                 content=content,
                 filename=filename,
                 metadata={
@@ -330,7 +334,7 @@ async def get_processing_status() -> ProcessingStatus:
     문서 처리 상태를 반환합니다.
     """
     try:
-        queue_status = document_service.get_queue_status()
+        queue_status = get_document_service().get_queue_status()
         
         return ProcessingStatus(
             queue_size=queue_status["queue_size"],
@@ -378,7 +382,7 @@ async def check_document_status(filename: str) -> Dict[str, Any]:
         # 2. 벡터 저장소에서 문서 존재 여부 확인
         try:
             # 파일명으로 벡터 저장소에서 검색
-            search_results = document_service.search_documents(
+            search_results = await get_document_service().asearch_documents(
                 query="", 
                 top_k=1, 
                 filter_metadata={"filename": filename}
@@ -441,7 +445,9 @@ async def delete_document(filename: str):
         
         try:
             # 파일명으로 직접 모든 관련 문서 삭제 (더 효율적)
-            deleted_count = document_service.delete_documents_by_filename(filename)
+            deleted_count = await get_document_service().run_in_executor(
+                get_document_service().delete_documents_by_filename, filename
+            )
             
             if deleted_count > 0:
                 logger.info(f"벡터 저장소에서 총 {deleted_count}개 문서 청크가 삭제되었습니다.")
@@ -567,13 +573,12 @@ async def dev_reset_all_data():
         # 2. 벡터 저장소에서 모든 문서 삭제
         deleted_docs = 0
         try:
-            # 모든 문서 조회
-            all_documents = document_service.get_all_documents()
+            # 모든 문서 ID 조회 (페이지 단위로 조회해 ID만 모은 뒤 삭제)
+            doc_ids = [doc.get("id") for doc in get_document_service().iter_all_documents()]
             
-            for doc in all_documents:
-                doc_id = doc.get("id")
+            for doc_id in doc_ids:
                 if doc_id and doc_id != "unknown":
-                    if document_service.delete_document(doc_id):
+                    if get_document_service().delete_document(doc_id):
                         deleted_docs += 1
                         logger.info(f"벡터 저장소에서 문서 삭제 완료: {doc_id}")
             
@@ -606,7 +611,7 @@ async def dev_reset_all_data():
         if cache_deleted:
             try:
                 logger.info("벡터 저장소 재초기화 시작")
-                document_service._initialize_vectorstore()
+                get_document_service()._initialize_vectorstore()
                 vectorstore_reinitialized = True
                 logger.info("벡터 저장소 재초기화 완료")
             except Exception as e:
@@ -647,10 +652,10 @@ async def get_vectorstore_status():
     """
     try:
         # 문서 수 조회
-        document_count = document_service.get_document_count()
+        document_count = await get_document_service().run_in_executor(get_document_service().get_document_count)
         
         # 모든 문서 정보 조회
-        all_documents = document_service.get_all_documents()
+        all_documents = await get_document_service().run_in_executor(get_document_service().get_all_documents)
         
         # 파일 시스템의 업로드된 파일 수 조회
         upload_dir_files = []
@@ -668,7 +673,7 @@ async def get_vectorstore_status():
         return JSONResponse(
             status_code=200,
             content={
-                "vectorstore_status": document_service.get_vectorstore_status(),
+                "vectorstore_status": await get_document_service().aget_vectorstore_status(),
                 "document_count": document_count,
                 "uploaded_files_count": len(upload_dir_files),
                 "uploaded_files": upload_dir_files,
@@ -40,6 +40,7 @@ class ProcessingResult(BaseModel):
     """처리 결과 모델"""
     file_name: str
     total_chunks: int
+    skipped_chunks: int = 0  # 이전 처리 결과를 재사용해 임베딩을 건너뛴 청크 수
     total_tokens: int
     embedding_dimension: int
     processing_success: bool
@@ -11,7 +11,7 @@ from fastapi import APIRouter, HTTPException, BackgroundTasks
 from pydantic import BaseModel, Field
 from datetime import datetime
 import numpy as np
-from sentence_transformers import SentenceTransformer
+from src.utils.embedding_models import get_sentence_transformer
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
@@ -28,7 +28,7 @@ QUERY_ENDPOINT = f"{CHROMA_API}/api/v2/tenants/{TENANT_ID}/databases/{DB_NAME}/c
 
 # 임베딩 모델 초기화 (384차원 모델 사용)
 try:
-    embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
+    embedding_model = get_sentence_transformer("all-MiniLM-L6-v2")
 except Exception as e:
     logger.error(f"임베딩 모델 초기화 실패: {e}")
     embedding_model = None
@@ -4,7 +4,7 @@ Health API 엔드포인트
 """
 
 import logging
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from datetime import datetime
 
 # psutil을 선택적으로 import
@@ -22,24 +22,22 @@ except ImportError:
 router = APIRouter()
 
 @router.get("/api/health")
-async def get_health():
+async def get_health(request: Request):
     """
     애플리케이션의 전체 상태를 반환합니다.
     
+    Args:
+        request: FastAPI 요청 객체 (app.state.http 공유 클라이언트 사용)
+    
     Returns:
         애플리케이션 상태 정보
     """
     try:
-        from src.config.settings import get_settings
-        settings = get_settings()
-        
         # Ollama 서버 연결 상태 확인
         ollama_connected = False
         try:
-            import httpx
-            async with httpx.AsyncClient(timeout=2.0) as client:
-                response = await client.get(f"{settings.ollama_base_url}/api/tags")
-                ollama_connected = response.status_code == 200
+            response = await request.app.state.http.get("/api/tags", timeout=2.0)
+            ollama_connected = response.status_code == 200
         except Exception as e:
             logger.debug(f"Ollama 서버 연결 실패: {e}")
             ollama_connected = False
@@ -3,10 +3,11 @@ Models API 엔드포인트
 Ollama 모델 관리 및 조회를 위한 API를 제공합니다.
 """
 
+import asyncio
 import logging
-from fastapi import APIRouter, HTTPException
+from time import monotonic
+from fastapi import APIRouter, HTTPException, Request
 from datetime import datetime
-import httpx
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
@@ -14,21 +15,41 @@ logger = logging.getLogger(__name__)
 # 라우터 생성
 router = APIRouter()
 
+# /api/models 응답 TTL 캐시 (exp: monotonic 만료 시각, val: 응답 dict)
+_models_cache = {"exp": 0.0, "val": None}
+# 캐시 만료 시 동시 요청이 Ollama를 한 번만 호출하도록 갱신을 직렬화
+_models_cache_lock = asyncio.Lock()
+
 @router.get("/api/models")
-async def get_models():
+async def get_models(request: Request):
     """
     현재 Ollama 서버에서 실행 중인 모델 목록을 반환합니다.
     
+    Args:
+        request: FastAPI 요청 객체 (app.state.http 공유 클라이언트 사용)
+    
     Returns:
-        모델 목록
+        모델 목록 (settings.models_cache_ttl 초 동안 캐시됨)
     """
+    if monotonic() < _models_cache["exp"]:
+        return _models_cache["val"]
+
+    async with _models_cache_lock:
+        # 대기 중에 다른 요청이 캐시를 갱신했으면 그대로 사용
+        if monotonic() < _models_cache["exp"]:
+            return _models_cache["val"]
+        return await _fetch_models(request)
+
+
+async def _fetch_models(request: Request):
+    """Ollama /api/ps를 조회해 응답을 만들고 TTL 캐시에 저장합니다."""
     try:
         # Ollama API에서 현재 실행 중(running) 모델 목록 가져오기
         from src.config.settings import get_settings
         settings = get_settings()
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(f"{settings.ollama_base_url}/api/ps")
+        # 시작 시 생성된 공유 클라이언트로 keep-alive 연결 재사용
+        response = await request.app.state.http.get("/api/ps")
         response.raise_for_status()
         data = response.json() or {}
 
@@ -57,12 +78,13 @@ async def get_models():
         except Exception:
             default_model_name = "gemma3:12b-it-qat"
 
-        if running_models:
-            preferred = [m for m in running_models if m.get("name") == default_model_name]
-            others = [m for m in running_models if m.get("name") != default_model_name]
-            running_models = preferred + others
+        # 안정 정렬이므로 기본 모델 외에는 원래 순서가 유지됨 (단일 패스)
+        running_models.sort(key=lambda m: m["name"] != default_model_name)
 
-        return {"models": running_models}
+        result = {"models": running_models}
+        _models_cache["val"] = result
+        _models_cache["exp"] = monotonic() + settings.models_cache_ttl
+        return result
     except Exception as e:
         logger.error(f"모델 목록 조회 중 오류: {e}")
         raise HTTPException(status_code=500, detail=f"모델 목록 조회 실패: {str(e)}")
@@ -5,6 +5,7 @@ Sessions API 엔드포인트
 
 import logging
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import ORJSONResponse
 from datetime import datetime
 
 # 로깅 설정
@@ -62,26 +63,19 @@ async def get_session_detail(session_id: str):
         세션 상세 정보
     """
     try:
-        from src.utils.session_manager import get_session
+        from src.utils.session_manager import get_session, get_session_messages
         session = get_session(session_id)
         
         if not session:
             raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다")
         
-        return {
+        # 모든 값이 문자열/기본형이므로 jsonable_encoder를 거치지 않고 바로 직렬화
+        return ORJSONResponse({
             "session_id": session.session_id,
-            "messages": [
-                {
-                    "role": msg.role,
-                    "content": msg.content,
-                    "timestamp": msg.timestamp,
-                    "model": msg.model
-                }
-                for msg in session.messages
-            ],
+            "messages": get_session_messages(session_id),
             "created_at": session.created_at,
             "last_active": session.last_active
-        }
+        })
     except Exception as e:
         logger.error(f"세션 상세 조회 중 오류: {e}")
         raise HTTPException(status_code=500, detail=f"세션 상세 조회 실패: {str(e)}")
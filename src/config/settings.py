@@ -1,9 +1,34 @@
-from pydantic_settings import BaseSettings
-from pydantic import field_validator
-from typing import Optional, List, Dict, Any
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
+from pydantic import PrivateAttr, field_validator
+from typing import Annotated, Optional, List, Dict, Any, Tuple
 import os
-import json
+from functools import lru_cache
+from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType
+
+# orjson이 설치되어 있으면 더 빠른 파서를 사용
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+
+@dataclass(frozen=True, slots=True)
+class ModelInfo:
+    """사용 가능한 모델 정보 (읽기 전용)"""
+    name: str
+    size: str
+    id: str
+    description: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class SystemPromptTemplate:
+    """시스템 프롬프트 템플릿 (읽기 전용)"""
+    name: str
+    prompt: str
+
 
 class Settings(BaseSettings):
     # =============================================================================
@@ -16,6 +41,8 @@ class Settings(BaseSettings):
     service_host: str = "1.237.52.240"
     service_port: int = 11040
     service_url: str = "http://1.237.52.240:11040"
+    server_backlog: int = 2048  # 대기 연결 큐 크기 (uvicorn 기본값 2048)
+    server_timeout_keep_alive: int = 30  # HTTP keep-alive 유지 시간(초) (uvicorn 기본값 5)
     
     # =============================================================================
     # Ollama 설정
@@ -23,6 +50,7 @@ class Settings(BaseSettings):
     ollama_base_url: str = "http://1.237.52.240:11434"
     ollama_timeout: int = 120
     ollama_max_retries: int = 3
+    models_cache_ttl: float = 30.0  # /api/models 응답 캐시 유지 시간(초), 0이면 캐시 안 함
     
 
     
@@ -38,36 +66,53 @@ class Settings(BaseSettings):
     chroma_password: Optional[str] = None
     chroma_ssl: bool = False
     chroma_anonymized_telemetry: bool = False
+    chroma_write_concurrency: int = 3  # http 모드에서 동시에 전송할 쓰기 배치 수, 1이면 동기 쓰기
     
     # 임베딩 모델 설정
     embedding_model_name: str = "all-MiniLM-L6-v2"  # 384차원 임베딩 모델 (외부 RAG 호환)
-    embedding_device: str = "cpu"
+    embedding_device: str = "cpu"  # "cpu", "cuda", "cuda:0", "mps" 등
+    embedding_batch_size: int = 64  # 한 번의 encode 호출에 묶어 처리할 청크 수
+    torch_num_threads: int = 0  # CPU 임베딩 추론에 쓸 torch 스레드 수, 0이면 torch 기본값
+    embedding_fp16: bool = False  # CUDA 장치에서 임베딩 모델을 FP16으로 실행 (CPU에서는 무시)
+    embedding_backend: str = "torch"  # "torch" 또는 "onnx" (onnx는 optimum[onnxruntime] 필요)
+    embedding_model_file: Optional[str] = None  # 예: "onnx/model_qint8_avx512_vnni.onnx" (int8 양자화 모델)
+    use_int8_onnx: bool = False  # 엑셀 임베딩에 ONNX int8 동적 양자화 모델 사용 (optimum[onnxruntime] 필요)
+    embedding_onnx_cache_dir: str = "data/onnx_models"  # 양자화된 ONNX 모델 저장 경로
+    excel_embedding_backend: str = "transformer"  # "transformer" 또는 "static" (static은 model2vec 필요)
+    static_embedding_model_name: str = "minishlab/potion-base-8M"  # 정적 임베딩 모델 (256차원)
+    excel_static_collection_name: str = "excel_static"  # 정적 임베딩은 차원/벡터 공간이 달라 별도 컬렉션 사용
+    embedding_cache_directory: Optional[str] = None  # 청크 임베딩 디스크 캐시 경로 (예: "data/embedding_cache"), 크기 제한/문서 삭제 시 정리가 없으므로 기본 비활성
     huggingface_api_key: Optional[str] = None
     
     # Chroma DB 컬렉션 설정
     chroma_collection_name: str = "documents"
     chroma_collection_metadata: Dict[str, Any] = {"description": "문서 임베딩 컬렉션"}
+    vectorstore_max_workers: int = 4  # 비동기 엔드포인트에서 Chroma 작업을 실행할 전용 스레드 수
+    search_batch_max_size: int = 32  # 동시 검색 쿼리를 한 번에 임베딩할 최대 개수
+    search_batch_wait_ms: float = 5.0  # 동시 검색 쿼리를 모으는 대기 시간(ms), 0이면 배칭 안 함
+    search_cache_size: int = 256  # 동일 검색 결과 캐시 최대 항목 수, 0이면 캐시 안 함
+    search_cache_ttl: float = 300.0  # 검색 결과 캐시 유지 시간(초) (외부 프로세스의 쓰기 반영 상한)
+    query_embedding_cache_size: int = 1024  # 쿼리 임베딩 캐시 최대 항목 수, 0이면 캐시 안 함
     
     # =============================================================================
     # 문서 처리 설정
     # =============================================================================
     chunk_size: int = 1000
     chunk_overlap: int = 200
+    chunk_regularize: bool = True  # 분할 후 과대 청크 재분할 + 짧은 조각 병합
+    # 토큰 단위 분할: 임베딩 모델의 fast 토크나이저(Rust)로 한 번 인코딩한 뒤 토큰 창으로 자름
+    chunk_by_tokens: bool = False
+    chunk_token_size: int = 256  # 토큰 단위 청크 크기 (all-MiniLM-L6-v2 최대 입력 길이)
+    chunk_token_overlap: int = 32
+    # 이 길이(문자) 이상의 긴 문서는 semantic-text-splitter(Rust)로 분할 (설치된 경우), 0이면 사용 안 함
+    rust_splitter_min_chars: int = 50_000
+    chroma_batch_size: int = 100  # 벡터 저장소에 한 번에 추가할 청크 수
+    document_embed_workers: int = 0  # 업로드 분할/임베딩 병렬 스레드 수, 0이면 CPU 수의 절반(최소 2)
+    document_batch_max_tasks: int = 8  # 처리 큐에서 한 번에 묶어 저장할 최대 업로드 수
     max_tokens: int = 4000
     upload_folder: str = "data/documents"
     max_file_size: int = 16 * 1024 * 1024  # 16MB
-    allowed_extensions: List[str] = [".pdf", ".txt", ".docx", ".md"]
-    
-    @field_validator('allowed_extensions', mode='before')
-    @classmethod
-    def parse_allowed_extensions(cls, v):
-        if isinstance(v, str):
-            try:
-                return json.loads(v)
-            except json.JSONDecodeError:
-                # JSON 파싱 실패 시 쉼표로 구분된 문자열로 처리
-                return [ext.strip() for ext in v.split(',')]
-        return v
+    allowed_extensions: Annotated[List[str], NoDecode] = [".pdf", ".txt", ".docx", ".md"]
     
     # =============================================================================
     # LLM 모델 설정 (기본값)
@@ -119,17 +164,7 @@ class Settings(BaseSettings):
     temperature_min: float = 0.0
     temperature_max: float = 2.0
     temperature_step: float = 0.1
-    temperature_presets: List[float] = [0.1, 0.3, 0.5, 0.7, 0.9, 1.0, 1.2]
-    
-    @field_validator('temperature_presets', mode='before')
-    @classmethod
-    def parse_temperature_presets(cls, v):
-        if isinstance(v, str):
-            try:
-                return json.loads(v)
-            except json.JSONDecodeError:
-                return [float(x.strip()) for x in v.split(',')]
-        return v
+    temperature_presets: Annotated[List[float], NoDecode] = [0.1, 0.3, 0.5, 0.7, 0.9, 1.0, 1.2]
     
     # =============================================================================
     # 고급 설정 - Top P 범위
@@ -137,17 +172,7 @@ class Settings(BaseSettings):
     top_p_min: float = 0.1
     top_p_max: float = 1.0
     top_p_step: float = 0.05
-    top_p_presets: List[float] = [0.1, 0.3, 0.5, 0.7, 0.9, 1.0]
-    
-    @field_validator('top_p_presets', mode='before')
-    @classmethod
-    def parse_top_p_presets(cls, v):
-        if isinstance(v, str):
-            try:
-                return json.loads(v)
-            except json.JSONDecodeError:
-                return [float(x.strip()) for x in v.split(',')]
-        return v
+    top_p_presets: Annotated[List[float], NoDecode] = [0.1, 0.3, 0.5, 0.7, 0.9, 1.0]
     
     # =============================================================================
     # 고급 설정 - Top K 범위
@@ -155,17 +180,7 @@ class Settings(BaseSettings):
     top_k_min: int = 1
     top_k_max: int = 100
     top_k_step: int = 1
-    top_k_presets: List[int] = [10, 20, 40, 60, 80, 100]
-    
-    @field_validator('top_k_presets', mode='before')
-    @classmethod
-    def parse_top_k_presets(cls, v):
-        if isinstance(v, str):
-            try:
-                return json.loads(v)
-            except json.JSONDecodeError:
-                return [int(x.strip()) for x in v.split(',')]
-        return v
+    top_k_presets: Annotated[List[int], NoDecode] = [10, 20, 40, 60, 80, 100]
     
     # =============================================================================
     # 고급 설정 - 최대 토큰 수 범위
@@ -173,37 +188,17 @@ class Settings(BaseSettings):
     max_tokens_min: int = 100
     max_tokens_max: int = 8192
     max_tokens_step: int = 100
-    max_tokens_presets: List[int] = [1024, 2048, 4096, 6144, 8192]
+    max_tokens_presets: Annotated[List[int], NoDecode] = [1024, 2048, 4096, 6144, 8192]
     # UI 기본 선택값 (env.settings의 MAX_TOKENS_DEFAULT로 설정 가능)
     max_tokens_default: int = 1024
     
-    @field_validator('max_tokens_presets', mode='before')
-    @classmethod
-    def parse_max_tokens_presets(cls, v):
-        if isinstance(v, str):
-            try:
-                return json.loads(v)
-            except json.JSONDecodeError:
-                return [int(x.strip()) for x in v.split(',')]
-        return v
-    
     # =============================================================================
     # 고급 설정 - Repeat Penalty 범위
     # =============================================================================
     repeat_penalty_min: float = 1.0
     repeat_penalty_max: float = 2.0
     repeat_penalty_step: float = 0.1
-    repeat_penalty_presets: List[float] = [1.0, 1.1, 1.2, 1.3, 1.5, 1.8]
-    
-    @field_validator('repeat_penalty_presets', mode='before')
-    @classmethod
-    def parse_repeat_penalty_presets(cls, v):
-        if isinstance(v, str):
-            try:
-                return json.loads(v)
-            except json.JSONDecodeError:
-                return [float(x.strip()) for x in v.split(',')]
-        return v
+    repeat_penalty_presets: Annotated[List[float], NoDecode] = [1.0, 1.1, 1.2, 1.3, 1.5, 1.8]
     
     # =============================================================================
     # 고급 설정 - RAG 관련 범위
@@ -211,61 +206,31 @@ class Settings(BaseSettings):
     rag_top_k_min: int = 1
     rag_top_k_max: int = 20
     rag_top_k_step: int = 1
-    rag_top_k_presets: List[int] = [3, 5, 7, 10, 15, 20]
-    
-    @field_validator('rag_top_k_presets', mode='before')
-    @classmethod
-    def parse_rag_top_k_presets(cls, v):
-        if isinstance(v, str):
-            try:
-                return json.loads(v)
-            except json.JSONDecodeError:
-                return [int(x.strip()) for x in v.split(',')]
-        return v
+    rag_top_k_presets: Annotated[List[int], NoDecode] = [3, 5, 7, 10, 15, 20]
     
     # =============================================================================
     # 사용 가능한 모델 목록
     # =============================================================================
-    available_models: List[Dict[str, Any]] = [
-        {"name": "gemma3:12b-it-qat", "size": "8.9 GB", "id": "5d4fa005e7bb", "description": "Google의 Gemma 3 12B 모델 (양자화됨)"},
-        {"name": "llama3.1:8b", "size": "4.9 GB", "id": "46e0c10c039e", "description": "Meta의 Llama 3.1 8B 모델"},
-        {"name": "llama3.2-vision:11b-instruct-q4_K_M", "size": "7.8 GB", "id": "6f2f9757ae97", "description": "Meta의 Llama 3.2 Vision 11B 모델"},
-        {"name": "qwen3:14b-q8_0", "size": "15 GB", "id": "304bf7349c71", "description": "Alibaba의 Qwen 3 14B 모델"},
-        {"name": "deepseek-r1:14b", "size": "9.0 GB", "id": "c333b7232bdb", "description": "DeepSeek의 R1 14B 모델"},
-        {"name": "deepseek-v2:16b-lite-chat-q8_0", "size": "16 GB", "id": "1d62ef756269", "description": "DeepSeek의 V2 16B Lite 모델"}
-    ]
-    
-    @field_validator('available_models', mode='before')
-    @classmethod
-    def parse_available_models(cls, v):
-        if isinstance(v, str):
-            try:
-                return json.loads(v)
-            except json.JSONDecodeError:
-                return v
-        return v
+    available_models: Tuple[ModelInfo, ...] = (
+        ModelInfo(name="gemma3:12b-it-qat", size="8.9 GB", id="5d4fa005e7bb", description="Google의 Gemma 3 12B 모델 (양자화됨)"),
+        ModelInfo(name="llama3.1:8b", size="4.9 GB", id="46e0c10c039e", description="Meta의 Llama 3.1 8B 모델"),
+        ModelInfo(name="llama3.2-vision:11b-instruct-q4_K_M", size="7.8 GB", id="6f2f9757ae97", description="Meta의 Llama 3.2 Vision 11B 모델"),
+        ModelInfo(name="qwen3:14b-q8_0", size="15 GB", id="304bf7349c71", description="Alibaba의 Qwen 3 14B 모델"),
+        ModelInfo(name="deepseek-r1:14b", size="9.0 GB", id="c333b7232bdb", description="DeepSeek의 R1 14B 모델"),
+        ModelInfo(name="deepseek-v2:16b-lite-chat-q8_0", size="16 GB", id="1d62ef756269", description="DeepSeek의 V2 16B Lite 모델")
+    )
     
     # =============================================================================
     # 시스템 프롬프트 템플릿
     # =============================================================================
-    system_prompt_templates: List[Dict[str, str]] = [
-        {"name": "기본", "prompt": "You are a helpful assistant. Answer questions based on the provided context when available. If the context doesn't contain relevant information, use your general knowledge to provide accurate and helpful answers. Always be informative and helpful."},
-        {"name": "한국어", "prompt": "당신은 도움이 되는 한국어 어시스턴트입니다. 제공된 컨텍스트를 기반으로 질문에 답변하세요. 컨텍스트에서 관련 정보를 찾을 수 없는 경우 일반적인 지식을 사용하여 정확하고 도움이 되는 답변을 제공하세요. 항상 유익하고 도움이 되도록 답변하세요."},
-        {"name": "코딩", "prompt": "You are a helpful programming assistant. Provide clear, well-documented code examples and explanations. Always consider best practices and security."},
-        {"name": "번역", "prompt": "You are a professional translator. Provide accurate and natural translations while preserving the original meaning and context."},
-        {"name": "요약", "prompt": "You are a summarization expert. Provide concise, accurate summaries that capture the key points and main ideas."},
-        {"name": "분석", "prompt": "You are an analytical assistant. Provide detailed analysis with supporting evidence and logical reasoning."}
-    ]
-    
-    @field_validator('system_prompt_templates', mode='before')
-    @classmethod
-    def parse_system_prompt_templates(cls, v):
-        if isinstance(v, str):
-            try:
-                return json.loads(v)
-            except json.JSONDecodeError:
-                return v
-        return v
+    system_prompt_templates: Tuple[SystemPromptTemplate, ...] = (
+        SystemPromptTemplate(name="기본", prompt="You are a helpful assistant. Answer questions based on the provided context when available. If the context doesn't contain relevant information, use your general knowledge to provide accurate and helpful answers. Always be informative and helpful."),
+        SystemPromptTemplate(name="한국어", prompt="당신은 도움이 되는 한국어 어시스턴트입니다. 제공된 컨텍스트를 기반으로 질문에 답변하세요. 컨텍스트에서 관련 정보를 찾을 수 없는 경우 일반적인 지식을 사용하여 정확하고 도움이 되는 답변을 제공하세요. 항상 유익하고 도움이 되도록 답변하세요."),
+        SystemPromptTemplate(name="코딩", prompt="You are a helpful programming assistant. Provide clear, well-documented code examples and explanations. Always consider best practices and security."),
+        SystemPromptTemplate(name="번역", prompt="You are a professional translator. Provide accurate and natural translations while preserving the original meaning and context."),
+        SystemPromptTemplate(name="요약", prompt="You are a summarization expert. Provide concise, accurate summaries that capture the key points and main ideas."),
+        SystemPromptTemplate(name="분석", prompt="You are an analytical assistant. Provide detailed analysis with supporting evidence and logical reasoning.")
+    )
     
     # =============================================================================
     # 보안 설정
@@ -293,16 +258,6 @@ class Settings(BaseSettings):
         {"value": "mcp_server", "label": "MCP 서버 검색", "description": "외부 MCP 서버의 웹 검색 서비스 사용"}
     ]
     
-    @field_validator('web_search_modes', mode='before')
-    @classmethod
-    def parse_web_search_modes(cls, v):
-        if isinstance(v, str):
-            try:
-                return json.loads(v)
-            except json.JSONDecodeError:
-                return v
-        return v
-    
     # =============================================================================
     # 외부 RAG 서버 설정
     # =============================================================================
@@ -341,55 +296,28 @@ class Settings(BaseSettings):
     # MCP 키워드 설정
     # =============================================================================
     # 날씨 관련 키워드 목록
-    mcp_weather_keywords: List[str] = [
+    mcp_weather_keywords: Annotated[List[str], NoDecode] = [
         "날씨", "기온", "습도", "비", "눈", "맑음", "흐림", "온도", "바람", "더울까", "추울까",
         "강수", "강설", "안개", "구름", "맑음", "흐림", "비올까", "눈올까", "바람불까",
         "체감온도", "최고기온", "최저기온", "일교차", "습도", "강수확률", "풍속", "풍향"
     ]
 
     # 주식 관련 키워드 목록
-    mcp_stock_keywords: List[str] = [
+    mcp_stock_keywords: Annotated[List[str], NoDecode] = [
         "주가", "주식", "종목", "증시", "코스피", "코스닥", "시가", "종가", "현재가",
         "삼성전자", "SK하이닉스", "LG전자", "포스코", "NAVER", "카카오", "현대차", "기아",
         "LG에너지솔루션", "삼성바이오로직스", "POSCO홀딩스", "삼성SDI", "LG화학", "현대모비스"
     ]
 
     # 웹 검색 관련 키워드 목록
-    mcp_search_keywords: List[str] = [
+    mcp_search_keywords: Annotated[List[str], NoDecode] = [
         "검색", "찾기", "최신", "뉴스", "유행", "기사", "통계", "실시간", "최근",
         "알려줘", "알려주세요", "찾아줘", "찾아주세요", "무엇인가요", "어떻게요",
         "궁금해", "알고 싶어", "현재 상황", "지금 뭐가", "요즘 뭐가", "최근에 뭐가"
     ]
 
-    @field_validator('mcp_weather_keywords', mode='before')
-    @classmethod
-    def parse_mcp_weather_keywords(cls, v):
-        if isinstance(v, str):
-            try:
-                return json.loads(v)
-            except json.JSONDecodeError:
-                return [keyword.strip() for keyword in v.split(',')]
-        return v
 
-    @field_validator('mcp_stock_keywords', mode='before')
-    @classmethod
-    def parse_mcp_stock_keywords(cls, v):
-        if isinstance(v, str):
-            try:
-                return json.loads(v)
-            except json.JSONDecodeError:
-                return [keyword.strip() for keyword in v.split(',')]
-        return v
 
-    @field_validator('mcp_search_keywords', mode='before')
-    @classmethod
-    def parse_mcp_search_keywords(cls, v):
-        if isinstance(v, str):
-            try:
-                return json.loads(v)
-            except json.JSONDecodeError:
-                return [keyword.strip() for keyword in v.split(',')]
-        return v
     
     # =============================================================================
     # 주식 데이터 설정
@@ -405,7 +333,7 @@ class Settings(BaseSettings):
     # =============================================================================
     # 기본 도시 목록 설정
     # =============================================================================
-    default_cities: List[str] = [
+    default_cities: Annotated[List[str], NoDecode] = [
         "서울", "부산", "대구", "인천", "광주", "대전", "울산", "세종",
         "수원", "성남", "의정부", "안양", "부천", "광명", "평택", "동두천",
         "안산", "고양", "과천", "구리", "남양주", "오산", "시흥", "군포",
@@ -423,16 +351,6 @@ class Settings(BaseSettings):
         "영암", "무안", "함평", "영광", "장성", "완도", "진도", "신안"
     ]
     
-    @field_validator('default_cities', mode='before')
-    @classmethod
-    def parse_default_cities(cls, v):
-        if isinstance(v, str):
-            try:
-                return json.loads(v)
-            except json.JSONDecodeError:
-                return [city.strip() for city in v.split(',')]
-        return v
-    
     # =============================================================================
     # 기본 주식 종목 매핑 설정
     # =============================================================================
@@ -459,25 +377,7 @@ class Settings(BaseSettings):
         "아모레퍼시픽": "090430"
     }
     
-    @field_validator('default_stock_mapping', mode='before')
-    @classmethod
-    def parse_default_stock_mapping(cls, v):
-        if isinstance(v, str):
-            try:
-                return json.loads(v)
-            except json.JSONDecodeError:
-                return v
-        return v
     
-    @field_validator('mcp_decision_methods', mode='before')
-    @classmethod
-    def parse_mcp_decision_methods(cls, v):
-        if isinstance(v, str):
-            try:
-                return json.loads(v)
-            except json.JSONDecodeError:
-                return v
-        return v
     
 
     
@@ -488,57 +388,97 @@ class Settings(BaseSettings):
     # =============================================================================
     # 환경 설정
     # =============================================================================
-    class Config:
-        env_file = "env.settings"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
-    
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        # 환경 변수에서 파싱된 값들을 설정
-        self._parse_environment_arrays()
-    
-    def _parse_environment_arrays(self):
-        """환경 변수에서 배열 형태의 값들을 파싱합니다."""
-        # 이제 field_validator를 사용하므로 이 메서드는 더 이상 필요하지 않습니다.
-        # 향후 필요시 구현 예정
-        return
+    # 설정 객체는 로드 이후 읽기 전용으로 사용하므로 frozen 으로 고정합니다.
+    # 값을 바꾸려면 reload_settings()로 새 인스턴스를 생성해야 합니다.
+    model_config = SettingsConfigDict(
+        env_file="env.settings",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        frozen=True,
+        validate_assignment=False,
+        extra="ignore",
+        populate_by_name=True,
+        env_parse_none_str="null",
+        env_nested_delimiter="__",
+    )
+
+    # 목록/딕셔너리 필드의 JSON 값은 pydantic-settings가 직접 파싱합니다.
+    # 아래 필드들은 쉼표 구분 문자열도 허용하므로 NoDecode로 원문을 받아 여기서 처리합니다.
+    @field_validator(
+        'allowed_extensions',
+        'temperature_presets',
+        'top_p_presets',
+        'top_k_presets',
+        'max_tokens_presets',
+        'repeat_penalty_presets',
+        'rag_top_k_presets',
+        'mcp_weather_keywords',
+        'mcp_stock_keywords',
+        'mcp_search_keywords',
+        'default_cities',
+        mode='before'
+    )
+    @classmethod
+    def parse_env_list(cls, v):
+        if isinstance(v, str):
+            if v.lstrip().startswith(('[', '{')):
+                return json_loads(v)
+            # 쉼표로 구분된 문자열로 처리 (요소 타입 변환은 pydantic이 수행)
+            return [item.strip() for item in v.split(',')]
+        return v
+
+    # 프리셋 조회 시마다 목록을 복사하지 않도록 로드 시점에 불변 튜플로 변환해 둡니다.
+    _parsed_presets: Dict[str, Tuple[Any, ...]] = PrivateAttr(default_factory=dict)
+    # 요약/검증 결과는 인스턴스가 불변이므로 처음 요청 시 한 번만 만들어 읽기 전용 뷰로 재사용합니다.
+    _config_summary: Optional[MappingProxyType] = PrivateAttr(default=None)
+    _validation_result: Optional[MappingProxyType] = PrivateAttr(default=None)
+    
+    def model_post_init(self, __context: Any) -> None:
+        """로드된 프리셋 목록을 한 번만 튜플로 변환합니다. (model_construct 경로에서도 호출됨)"""
+        self._parsed_presets = {
+            "temperature": tuple(self.temperature_presets),
+            "top_p": tuple(self.top_p_presets),
+            "top_k": tuple(self.top_k_presets),
+            "max_tokens": tuple(self.max_tokens_presets),
+            "repeat_penalty": tuple(self.repeat_penalty_presets),
+            "rag_top_k": tuple(self.rag_top_k_presets),
+        }
     
-    def get_available_models(self) -> List[Dict[str, Any]]:
+    def get_available_models(self) -> Tuple[ModelInfo, ...]:
         """사용 가능한 모델 목록을 반환합니다."""
         return self.available_models
     
-    def get_system_prompt_templates(self) -> List[Dict[str, str]]:
+    def get_system_prompt_templates(self) -> Tuple[SystemPromptTemplate, ...]:
         """시스템 프롬프트 템플릿을 반환합니다."""
         return self.system_prompt_templates
     
-    def get_temperature_presets(self) -> List[float]:
+    def get_temperature_presets(self) -> Tuple[float, ...]:
         """Temperature 프리셋을 반환합니다."""
-        return self.temperature_presets
+        return self._parsed_presets["temperature"]
     
-    def get_top_p_presets(self) -> List[float]:
+    def get_top_p_presets(self) -> Tuple[float, ...]:
         """Top P 프리셋을 반환합니다."""
-        return self.top_p_presets
+        return self._parsed_presets["top_p"]
     
-    def get_top_k_presets(self) -> List[int]:
+    def get_top_k_presets(self) -> Tuple[int, ...]:
         """Top K 프리셋을 반환합니다."""
-        return self.top_k_presets
+        return self._parsed_presets["top_k"]
     
-    def get_max_tokens_presets(self) -> List[int]:
+    def get_max_tokens_presets(self) -> Tuple[int, ...]:
         """Max Tokens 프리셋을 반환합니다."""
-        return self.max_tokens_presets
+        return self._parsed_presets["max_tokens"]
 
     def get_default_max_tokens(self) -> int:
         """Max Tokens 기본값을 반환합니다."""
         return self.max_tokens_default
     
-    def get_repeat_penalty_presets(self) -> List[float]:
+    def get_repeat_penalty_presets(self) -> Tuple[float, ...]:
         """Repeat Penalty 프리셋을 반환합니다."""
-        return self.repeat_penalty_presets
+        return self._parsed_presets["repeat_penalty"]
     
-    def get_rag_top_k_presets(self) -> List[int]:
+    def get_rag_top_k_presets(self) -> Tuple[int, ...]:
         """RAG Top K 프리셋을 반환합니다."""
-        return self.rag_top_k_presets
+        return self._parsed_presets["rag_top_k"]
     
     def get_chroma_client_config(self) -> Dict[str, Any]:
         """Chroma DB 클라이언트 설정을 반환합니다."""
@@ -557,11 +497,20 @@ class Settings(BaseSettings):
                 "port": self.chroma_port,
                 "username": self.chroma_username,
                 "password": self.chroma_password,
-                "ssl": self.chroma_ssl
+                "ssl": self.chroma_ssl,
+                "settings": self._chroma_http_client_settings()
             }
         else:
             raise ValueError(f"지원하지 않는 Chroma DB 모드입니다: {self.chroma_mode}")
     
+    def _chroma_http_client_settings(self) -> Dict[str, Any]:
+        """HTTP 클라이언트 설정 (HttpClient에는 username/password 인자가 없으므로 Basic 인증은 설정으로 전달)"""
+        client_settings: Dict[str, Any] = {"anonymized_telemetry": self.chroma_anonymized_telemetry}
+        if self.chroma_username and self.chroma_password:
+            client_settings["chroma_client_auth_provider"] = "chromadb.auth.basic_authn.BasicAuthClientProvider"
+            client_settings["chroma_client_auth_credentials"] = f"{self.chroma_username}:{self.chroma_password}"
+        return client_settings
+    
     def get_chroma_url(self) -> str:
         """Chroma DB URL을 반환합니다."""
         if self.chroma_mode == "local":
@@ -574,8 +523,13 @@ class Settings(BaseSettings):
     
 
     
-    def validate_settings(self) -> Dict[str, Any]:
-        """설정값들의 유효성을 검증하고 결과를 반환합니다."""
+    def validate_settings(self) -> MappingProxyType:
+        """설정값들의 유효성을 검증하고 결과를 반환합니다. (읽기 전용, 인스턴스당 한 번 계산)"""
+        if self._validation_result is None:
+            self._validation_result = self._build_validation_result()
+        return self._validation_result
+
+    def _build_validation_result(self) -> MappingProxyType:
         validation_results = {
             "valid": True,
             "errors": [],
@@ -604,11 +558,18 @@ class Settings(BaseSettings):
         if not (self.top_p_min <= self.default_top_p <= self.top_p_max):
             validation_results["warnings"].append(f"기본 Top P가 범위를 벗어납니다: {self.default_top_p}")
         
-        return validation_results
-    
-    def get_config_summary(self) -> Dict[str, Any]:
-        """설정 요약 정보를 반환합니다."""
-        return {
+        validation_results["errors"] = tuple(validation_results["errors"])
+        validation_results["warnings"] = tuple(validation_results["warnings"])
+        return MappingProxyType(validation_results)
+    
+    def get_config_summary(self) -> MappingProxyType:
+        """설정 요약 정보를 반환합니다. (읽기 전용, 인스턴스당 한 번 계산)"""
+        if self._config_summary is None:
+            self._config_summary = self._build_config_summary()
+        return self._config_summary
+
+    def _build_config_summary(self) -> MappingProxyType:
+        summary = {
             "server": {
                 "host": self.host,
                 "port": self.port,
@@ -649,22 +610,31 @@ class Settings(BaseSettings):
                 "max_messages": self.max_messages_per_session
             }
         }
+        return MappingProxyType({key: MappingProxyType(section) for key, section in summary.items()})
 
-# 전역 설정 인스턴스 생성
-_settings_instance = None
+def _has_env_overrides() -> bool:
+    """env.settings 파일 또는 설정 필드와 일치하는 환경 변수가 있는지 확인합니다."""
+    env_file = Settings.model_config.get("env_file")
+    if env_file and Path(env_file).is_file():
+        return True
+    delimiter = Settings.model_config.get("env_nested_delimiter") or "__"
+    return any(
+        key.lower().split(delimiter, 1)[0] in Settings.model_fields
+        for key in os.environ
+    )
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """설정 인스턴스를 반환합니다. 싱글톤 패턴을 사용합니다."""
-    global _settings_instance
-    if _settings_instance is None:
-        _settings_instance = Settings()
-    return _settings_instance
+    """설정 인스턴스를 반환합니다. 프로세스당 한 번만 env.settings를 읽고 검증합니다."""
+    if not _has_env_overrides():
+        # 덮어쓸 값이 없으면 신뢰할 수 있는 기본값이므로 검증 없이 생성
+        return Settings.model_construct()
+    return Settings()
 
 def reload_settings() -> Settings:
     """설정을 다시 로드합니다."""
-    global _settings_instance
-    _settings_instance = Settings()
-    return _settings_instance
+    get_settings.cache_clear()
+    return get_settings()
 
 # 기본 설정 인스턴스 (하위 호환성을 위해 유지)
 settings = get_settings() 
\ No newline at end of file
@@ -5,21 +5,63 @@ Ollama 대화형 인터페이스의 진입점입니다.
 
 import logging
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime
+from time import perf_counter, time
+import httpx
+from starlette.concurrency import run_in_threadpool
 
 
 # API 엔드포인트 라우터들 import
 from src.api.endpoints import chat, health, models, sessions, settings as settings_router, documents, word_embedding, excel_embedding
 
+# 서비스 싱글톤 (chat 라우터 import 시 이미 로드되므로 추가 비용 없음)
+from src.services.rag_service import rag_service
+from src.services.document_service import get_document_service
+
 
 # 로깅 설정
 logging.basicConfig(level=logging.WARNING)
 logger = logging.getLogger(__name__)
 
+# 요청 로깅에서 제외할 경로 (health 관련 API)
+_SKIP_LOG_PREFIXES = ('/api/health', '/api/system/resources', '/api/info')
+
+# 라우터 등록용 prefix/tags 상수 (import 시 한 번만 생성)
+_ROUTER_PREFIX = ""
+_CHAT_TAGS = ("Chat",)
+_HEALTH_TAGS = ("Health",)
+_MODELS_TAGS = ("Models",)
+_SESSIONS_TAGS = ("Sessions",)
+_SETTINGS_TAGS = ("Settings",)
+_DOCUMENTS_TAGS = ("Documents",)
+_WORD_EMBEDDING_TAGS = ("Word Embedding",)
+_EXCEL_EMBEDDING_TAGS = ("Excel Embedding",)
+_EXTERNAL_RAG_TAGS = ("External RAG",)
+
+# Ollama HTTP 클라이언트 연결 풀 한도 (keep-alive로 요청마다 TCP 핸드셰이크를 피함)
+_OLLAMA_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=40)
+_OLLAMA_HTTP_TIMEOUT = 10.0
+
+# 에러 응답 본문 (timestamp만 요청마다 채움)
+_NOT_FOUND_CONTENT = {"error": "요청한 리소스를 찾을 수 없습니다."}
+_INTERNAL_ERROR_CONTENT = {"error": "내부 서버 오류가 발생했습니다."}
+
+# 에러 응답용 타임스탬프 캐시 (초 단위, ISO 문자열)
+_last_iso_ts = (0, "")
+
+
+def _iso_timestamp() -> str:
+    """초 단위로 캐시된 현재 시각의 ISO-8601 문자열을 반환합니다."""
+    global _last_iso_ts
+    sec = int(time())
+    if sec != _last_iso_ts[0]:
+        _last_iso_ts = (sec, datetime.fromtimestamp(sec).isoformat())
+    return _last_iso_ts[1]
+
 
 # FastAPI 앱 생성
 app = FastAPI(
@@ -27,7 +69,8 @@ app = FastAPI(
     description="FastAPI 기반 Ollama 대화형 인터페이스 - 날씨, 웹 검색, 파일 시스템, 데이터베이스 통합 서비스",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse  # 모든 JSON 응답을 orjson으로 직렬화
 )
 
 
@@ -38,8 +81,19 @@ settings = get_settings()
 # CORS 허용 도메인 설정 - 모든 IP 허용
 cors_origins = ["*"]
 
+class _FrozenCORSMiddleware(CORSMiddleware):
+    """허용 목록을 frozenset으로 보관해 preflight 검사 시 O(1)로 조회하는 CORS 미들웨어"""
+
+    def __init__(self, app, **kwargs):
+        super().__init__(app, **kwargs)
+        # 응답 헤더 문자열은 상위 __init__에서 이미 계산되므로 조회용 컨테이너만 교체
+        self.allow_methods = frozenset(self.allow_methods)
+        self.allow_origins = frozenset(self.allow_origins)
+        self.allow_headers = frozenset(self.allow_headers)
+
+
 app.add_middleware(
-    CORSMiddleware,
+    _FrozenCORSMiddleware,
     allow_origins=cors_origins,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
@@ -50,15 +104,32 @@ app.add_middleware(
 # 정적 파일 및 템플릿 설정
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
+# 템플릿 파일은 배포 중 바뀌지 않으므로 요청마다 mtime을 확인하지 않음
+templates.env.auto_reload = False
+# 메인 페이지 템플릿은 한 번만 로드해 재사용 (url_for가 요청 호스트를 쓰므로 렌더링은 요청마다 수행)
+_app_template = templates.get_template("app.html")
 
 # 외부 RAG 서비스 헬스 체크 시작
 @app.on_event("startup")
 async def startup_event():
     """애플리케이션 시작 시 실행되는 이벤트"""
+    # 엔드포인트들이 공유하는 Ollama HTTP 클라이언트 (request.app.state.http)
+    app.state.http = httpx.AsyncClient(
+        base_url=settings.ollama_base_url,
+        timeout=_OLLAMA_HTTP_TIMEOUT,
+        limits=_OLLAMA_HTTP_LIMITS,
+    )
+
+    # RAG 디렉토리 문서 로드 (DocumentService 생성 포함, 이벤트 루프를 막지 않도록 스레드에서 실행)
+    try:
+        await run_in_threadpool(rag_service.ensure_rag_documents_loaded)
+    except Exception as e:
+        logger.error(f"RAG 문서 로드 실패: {e}")
+
     try:
-        from src.services.rag_service import rag_service
-        if hasattr(rag_service, 'external_rag_service'):
-            rag_service.external_rag_service.start_health_check()
+        external_rag_service = getattr(rag_service, 'external_rag_service', None)
+        if external_rag_service is not None:
+            external_rag_service.start_health_check()
             logger.info("외부 RAG 서비스 헬스 체크 시작됨")
     except Exception as e:
         logger.error(f"외부 RAG 서비스 헬스 체크 시작 실패: {e}")
@@ -67,15 +138,21 @@ async def startup_event():
 async def shutdown_event():
     """애플리케이션 종료 시 실행되는 이벤트"""
     try:
-        from src.services.rag_service import rag_service
-        if hasattr(rag_service, 'external_rag_service'):
-            rag_service.external_rag_service.stop_health_check()
+        await app.state.http.aclose()
+    except Exception as e:
+        logger.error(f"Ollama HTTP 클라이언트 종료 실패: {e}")
+
+    try:
+        external_rag_service = getattr(rag_service, 'external_rag_service', None)
+        if external_rag_service is not None:
+            external_rag_service.stop_health_check()
+            await external_rag_service.aclose()
             logger.info("외부 RAG 서비스 헬스 체크 중지됨")
         # 문서 처리 스레드 안전 종료
         try:
-            from src.services.document_service import document_service
-            if hasattr(document_service, 'shutdown'):
-                document_service.shutdown()
+            # 생성된 적 없는 서비스를 종료하려고 새로 만들지 않음
+            if get_document_service.cache_info().currsize:
+                get_document_service().shutdown()
                 logger.info("문서 처리 서비스 종료됨")
         except Exception as e:
             logger.error(f"문서 처리 서비스 종료 실패: {e}")
@@ -84,18 +161,18 @@ async def shutdown_event():
 
 
 # API 라우터 등록 - 각 기능별 라우터를 FastAPI 앱에 등록하여 모듈화된 API 구조 구성
-app.include_router(chat.router, prefix="", tags=["Chat"]) # 채팅 기능 라우터 - Ollama 모델과의 대화, 세션 관리 등
-app.include_router(health.router, prefix="", tags=["Health"]) # 헬스 체크 라우터 - 애플리케이션 상태 확인, 서비스 모니터링, 시스템 정보 등
-app.include_router(models.router, prefix="", tags=["Models"]) # 모델 관리 라우터 - Ollama 모델 목록 조회, 모델 상세 정보, 모델 다운로드/삭제 등
-app.include_router(sessions.router, prefix="", tags=["Sessions"]) # 세션 관리 라우터 - 채팅 세션 생성, 조회, 삭제, 제목 업데이트 등
-app.include_router(settings_router.router, prefix="", tags=["Settings"]) # 설정 관리 라우터 - 설정 조회, 리로드, 검증, 프리셋 관리 등
-app.include_router(documents.router, prefix="", tags=["Documents"]) # 문서 관리 라우터 - 파일 업로드, 목록 조회, 삭제 등
-app.include_router(word_embedding.router, prefix="", tags=["Word Embedding"]) # 워드 임베딩 라우터 - 워드 문서 RAG 처리 및 검색
-app.include_router(excel_embedding.router, prefix="", tags=["Excel Embedding"]) # 엑셀 임베딩 라우터 - 엑셀 문서 RAG 처리 및 검색
+app.include_router(chat.router, prefix=_ROUTER_PREFIX, tags=_CHAT_TAGS) # 채팅 기능 라우터 - Ollama 모델과의 대화, 세션 관리 등
+app.include_router(health.router, prefix=_ROUTER_PREFIX, tags=_HEALTH_TAGS) # 헬스 체크 라우터 - 애플리케이션 상태 확인, 서비스 모니터링, 시스템 정보 등
+app.include_router(models.router, prefix=_ROUTER_PREFIX, tags=_MODELS_TAGS) # 모델 관리 라우터 - Ollama 모델 목록 조회, 모델 상세 정보, 모델 다운로드/삭제 등
+app.include_router(sessions.router, prefix=_ROUTER_PREFIX, tags=_SESSIONS_TAGS) # 세션 관리 라우터 - 채팅 세션 생성, 조회, 삭제, 제목 업데이트 등
+app.include_router(settings_router.router, prefix=_ROUTER_PREFIX, tags=_SETTINGS_TAGS) # 설정 관리 라우터 - 설정 조회, 리로드, 검증, 프리셋 관리 등
+app.include_router(documents.router, prefix=_ROUTER_PREFIX, tags=_DOCUMENTS_TAGS) # 문서 관리 라우터 - 파일 업로드, 목록 조회, 삭제 등
+app.include_router(word_embedding.router, prefix=_ROUTER_PREFIX, tags=_WORD_EMBEDDING_TAGS) # 워드 임베딩 라우터 - 워드 문서 RAG 처리 및 검색
+app.include_router(excel_embedding.router, prefix=_ROUTER_PREFIX, tags=_EXCEL_EMBEDDING_TAGS) # 엑셀 임베딩 라우터 - 엑셀 문서 RAG 처리 및 검색
 
 # 외부 RAG 라우터 등록
 from src.api.endpoints import external_rag
-app.include_router(external_rag.router, prefix="", tags=["External RAG"]) # 외부 RAG 라우터 - 외부 Chroma API 연동
+app.include_router(external_rag.router, prefix=_ROUTER_PREFIX, tags=_EXTERNAL_RAG_TAGS) # 외부 RAG 라우터 - 외부 Chroma API 연동
 
 
 
@@ -112,7 +189,7 @@ async def index(request: Request):
     Returns:
         HTML 응답
     """
-    return templates.TemplateResponse("app.html", {"request": request})
+    return HTMLResponse(_app_template.render(request=request))
 
 
 
@@ -133,12 +210,9 @@ async def not_found_handler(request: Request, exc: HTTPException):
     Returns:
         JSON 응답
     """
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=404,
-        content={
-            "error": "요청한 리소스를 찾을 수 없습니다.",
-            "timestamp": datetime.now().isoformat()
-        }
+        content={**_NOT_FOUND_CONTENT, "timestamp": _iso_timestamp()}
     )
 
 
@@ -155,12 +229,9 @@ async def internal_error_handler(request: Request, exc: HTTPException):
         JSON 응답
     """
     logger.error(f"내부 서버 오류: {exc}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
-        content={
-            "error": "내부 서버 오류가 발생했습니다.",
-            "timestamp": datetime.now().isoformat()
-        }
+        content={**_INTERNAL_ERROR_CONTENT, "timestamp": _iso_timestamp()}
     )
 
 @app.middleware("http")
@@ -175,20 +246,26 @@ async def log_requests(request: Request, call_next):
     Returns:
         응답 객체
     """
+    # URL 객체를 만들지 않고 ASGI scope에서 바로 읽음
+    scope = request.scope
+    path = scope["path"]
+    method = scope["method"]
+    
     # health API 요청은 로깅하지 않음
-    if request.url.path.startswith('/api/health') or request.url.path.startswith('/api/system/resources') or request.url.path.startswith('/api/info'):
+    # 공통 접두사 '/api/'를 먼저 비교해 비 API 요청은 튜플 startswith를 건너뜀
+    if path[:5] == "/api/" and path.startswith(_SKIP_LOG_PREFIXES):
         return await call_next(request)
     
-    start_time = datetime.now()
+    start_time = perf_counter()
     
     # 요청 로깅
-    logger.info(f"요청 시작: {request.method} {request.url.path}")
+    logger.info("요청 시작: %s %s", method, path)
     
     response = await call_next(request)
     
     # 응답 로깅
-    process_time = (datetime.now() - start_time).total_seconds()
-    logger.info(f"요청 완료: {request.method} {request.url.path} - {response.status_code} ({process_time:.3f}초)")
+    process_time = perf_counter() - start_time
+    logger.info("요청 완료: %s %s - %d (%.3f초)", method, path, response.status_code, process_time)
     
     return response
 
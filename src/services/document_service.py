@@ -5,10 +5,16 @@ import asyncio
 import queue
 import warnings
 import re
-from typing import List, Dict, Any, Optional, Callable
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import List, Dict, Any, Optional, Callable, Tuple, Iterable, Iterator
 from datetime import datetime
 import logging
 
+import numpy as np
+
 # PyTorch FutureWarning 억제
 warnings.filterwarnings('ignore', category=FutureWarning)
 
@@ -21,10 +27,24 @@ from langchain_community.document_loaders import (
 import chromadb
 from langchain_chroma import Chroma
 from langchain_huggingface import HuggingFaceEmbeddings
-from langchain.schema import Document
 
 import io
 
+# Rust 기반 텍스트 분할기 (선택적 기능)
+try:
+    from semantic_text_splitter import TextSplitter as RustTextSplitter
+    RUST_SPLITTER_AVAILABLE = True
+except ImportError:
+    RUST_SPLITTER_AVAILABLE = False
+
+# 청크 임베딩 캐시 (선택적 기능)
+try:
+    from langchain.embeddings import CacheBackedEmbeddings
+    from langchain.storage import LocalFileStore
+    EMBEDDING_CACHE_AVAILABLE = True
+except ImportError:
+    EMBEDDING_CACHE_AVAILABLE = False
+
 # 엑셀 전처리 프로세서 추가
 from src.services.excel_processor import excel_processor
 
@@ -35,55 +55,293 @@ from src.services.word_processor import word_processor
 from src.services.pdf_processor import pdf_processor
 
 from src.config.settings import settings
+from src.utils.embedding_models import register_sentence_transformer
+from src.utils.rw_lock import RWLock
 
 logger = logging.getLogger(__name__)
 
+
+# 파일 확장자 -> 문서 타입 (호출마다 dict를 새로 만들지 않도록 모듈 수준에 한 번만 정의)
+_EXT_TO_DOCTYPE: Dict[str, str] = {
+    '.pdf': 'pdf',
+    '.txt': 'text',
+    '.docx': 'word',  # .doc은 지원하지 않음
+    '.md': 'markdown',
+    '.xlsx': 'excel',
+    '.xls': 'excel',
+    '.csv': 'excel'
+}
+
+
+def _embedding_model_kwargs() -> Dict[str, Any]:
+    """설정에 따라 SentenceTransformer 생성 인자를 구성합니다."""
+    model_kwargs: Dict[str, Any] = {'device': settings.embedding_device}
+    if settings.embedding_backend.lower() == "onnx":
+        # optimum은 ONNX 백엔드를 쓸 때만 필요하므로 여기서 선택적으로 확인
+        try:
+            import optimum.onnxruntime  # noqa: F401
+        except ImportError:
+            logger.warning("optimum[onnxruntime]이 설치되지 않아 torch 백엔드로 임베딩 모델을 로드합니다.")
+            return model_kwargs
+        model_kwargs['backend'] = "onnx"
+        if settings.embedding_model_file:
+            # int8 양자화 ONNX 파일 등 특정 모델 파일 지정
+            model_kwargs['model_kwargs'] = {'file_name': settings.embedding_model_file}
+    elif settings.embedding_fp16 and settings.embedding_device.startswith("cuda"):
+        # GPU에서는 FP16 가중치로 로드 (텐서 코어 연산, 메모리 대역폭 절반)
+        model_kwargs['model_kwargs'] = {'torch_dtype': "float16"}
+    return model_kwargs
+
+
+class _QueryEmbeddingBatcher:
+    """여러 스레드에서 동시에 들어온 검색 쿼리를 짧은 시간 창 동안 모아 한 번에 임베딩합니다.
+
+    첫 요청 스레드가 리더가 되어 max_wait 동안(또는 max_batch가 찰 때까지) 기다린 뒤
+    모인 쿼리를 max_batch개씩 embed_documents로 인코딩하고, 나머지 스레드는 결과만 받아 갑니다.
+    (깨어난 뒤 목록을 가져가기 전에 도착한 쿼리도 같은 리더가 처리하되 한 번에 max_batch개를 넘지 않음)
+    """
+
+    def __init__(self, embeddings, max_batch: int, max_wait: float):
+        self._embeddings = embeddings
+        self._max_batch = max_batch
+        self._max_wait = max_wait
+        self._lock = threading.Lock()
+        self._full = threading.Event()
+        self._pending: List[Tuple[str, Future]] = []
+
+    def embed(self, query: str) -> List[float]:
+        future: Future = Future()
+        with self._lock:
+            self._pending.append((query, future))
+            is_leader = len(self._pending) == 1
+            if len(self._pending) >= self._max_batch:
+                self._full.set()
+
+        if is_leader:
+            self._full.wait(self._max_wait)
+            with self._lock:
+                batch, self._pending = self._pending, []
+                self._full.clear()
+            for start in range(0, len(batch), self._max_batch):
+                group = batch[start:start + self._max_batch]
+                try:
+                    vectors = self._embeddings.embed_documents([q for q, _ in group])
+                except Exception as e:
+                    for _, f in group:
+                        f.set_exception(e)
+                else:
+                    for (_, f), vector in zip(group, vectors):
+                        f.set_result(vector)
+
+        return future.result()
+
+
 class DocumentService:
     def __init__(self):
         # HuggingFace API 키 설정
         if settings.huggingface_api_key:
             os.environ['HUGGINGFACE_API_KEY'] = settings.huggingface_api_key
         
+        model_kwargs = _embedding_model_kwargs()
         self.embeddings = HuggingFaceEmbeddings(
             model_name=settings.embedding_model_name,
-            model_kwargs={'device': 'cpu'}
+            model_kwargs=model_kwargs,
+            encode_kwargs={'batch_size': settings.embedding_batch_size}
         )
+        # 같은 모델을 쓰는 워드/엑셀/외부 RAG 서비스가 다시 로드하지 않도록 공유 목록에 등록
+        if settings.embedding_backend.lower() != "onnx":
+            register_sentence_transformer(settings.embedding_model_name, self.embeddings._client)
+        # 업로드 청크용 임베딩: 같은 텍스트(재업로드, 공통 머리말 등)는 디스크 캐시에서 재사용
+        # 검색 쿼리는 캐시 없이 self.embeddings를 그대로 사용
+        self._document_embeddings = self._create_document_embeddings(model_kwargs)
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=settings.chunk_size,
             chunk_overlap=settings.chunk_overlap,
             length_function=len,
         )
+        # 확장자별 로더 (PDF/워드/엑셀은 전처리 프로세서 사용)
+        self._loaders: Dict[str, Callable[[str], str]] = {
+            '.pdf': pdf_processor.process_pdf_file,
+            '.txt': self._load_txt,
+            '.docx': word_processor.extract_text_from_word,
+            '.doc': self._reject_doc,
+            '.md': self._load_md,
+            '.xlsx': excel_processor.extract_text_from_excel,
+            '.xls': excel_processor.extract_text_from_excel,
+            '.csv': excel_processor.extract_text_from_excel,
+        }
+        # 긴 문서용 Rust 분할기 (짧은 문서는 FFI 오버헤드가 더 커서 Python 분할기 유지)
+        self._rust_splitter = None
+        if RUST_SPLITTER_AVAILABLE and settings.rust_splitter_min_chars > 0:
+            self._rust_splitter = RustTextSplitter(
+                capacity=settings.chunk_size,
+                overlap=settings.chunk_overlap
+            )
+        # 토큰 단위 분할에 쓸 임베딩 모델의 fast 토크나이저 (없으면 문자 단위 분할 유지)
+        self._chunk_tokenizer = None
+        if settings.chunk_by_tokens:
+            tokenizer = getattr(getattr(self.embeddings, "_client", None), "tokenizer", None)
+            if tokenizer is not None and getattr(tokenizer, "is_fast", False):
+                self._chunk_tokenizer = tokenizer
+            else:
+                logger.warning("임베딩 모델에 fast 토크나이저가 없어 문자 단위 분할을 사용합니다.")
+        # 동시 검색 쿼리 임베딩 배처 (대기 시간이 0이면 사용하지 않음)
+        self._query_batcher = None
+        if settings.search_batch_wait_ms > 0:
+            self._query_batcher = _QueryEmbeddingBatcher(
+                self.embeddings,
+                max_batch=settings.search_batch_max_size,
+                max_wait=settings.search_batch_wait_ms / 1000.0
+            )
+        # 동일 검색(쿼리, top_k, 필터) 결과 LRU 캐시 - 쓰기 시 세대 번호를 올려 무효화
+        self._search_cache: "OrderedDict[Tuple[str, int, str], Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._search_cache_lock = threading.Lock()
+        self._search_cache_generation = 0
+        # 쿼리 임베딩 LRU 캐시 (임베딩은 저장소 내용과 무관하므로 쓰기 시 무효화하지 않음)
+        self._query_embedding_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._query_embedding_cache_lock = threading.Lock()
         self.vectorstore = None
         # 스레드 안전성을 위한 락 추가
-        self._write_lock = threading.RLock()  # 재진입 가능한 락
-        self._read_lock = threading.RLock()   # 읽기 작업용 락
+        # 검색/조회는 동시에, 추가/삭제는 단독으로 실행 (검색과 삭제가 겹치지 않음)
+        self._rw = RWLock()
         
-        # 비동기 문서 처리를 위한 큐 시스템
+        # 비동기 문서 처리: 분할/임베딩은 스레드 풀에서 병렬로 수행하고 (torch/ONNX 추론은 GIL 해제)
+        # Chroma 쓰기는 큐를 통해 단일 쓰기 스레드가 직렬로 처리
+        self._embed_pool = ThreadPoolExecutor(
+            max_workers=settings.document_embed_workers or max(2, (os.cpu_count() or 2) // 2),
+            thread_name_prefix="document-embed"
+        )
         self._processing_queue = queue.Queue()
         self._processing_thread = None
         self._stop_processing = False
         self._start_processing_thread()
         
+        # 비동기 엔드포인트의 Chroma 조회/삭제를 이벤트 루프 밖에서 실행할 전용 스레드 풀
+        # (업로드 처리 스레드와 분리되어 검색이 업로드에 밀리지 않음)
+        self._vectorstore_executor = ThreadPoolExecutor(
+            max_workers=settings.vectorstore_max_workers,
+            thread_name_prefix="vectorstore"
+        )
+        
+        # http 모드에서 배치 쓰기를 동시에 보내는 AsyncHttpClient용 이벤트 루프 (다른 모드는 사용 안 함)
+        self._write_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_collection = None
+        
         self._initialize_vectorstore()
     
 
     
-    def _get_document_type(self, file_extension: str) -> str:
+    @staticmethod
+    def _embedding_cache_namespace(model_kwargs: Dict[str, Any]) -> str:
+        """실제 로드된 모델 구성(모델/백엔드/모델 파일/정밀도)별 캐시 네임스페이스"""
+        loader_kwargs = model_kwargs.get('model_kwargs', {})
+        parts = [
+            settings.embedding_model_name,
+            model_kwargs.get('backend', "torch"),
+            loader_kwargs.get('file_name', "default"),
+            loader_kwargs.get('torch_dtype', "float32"),
+        ]
+        # LocalFileStore 키에 허용되는 문자만 남기고 구성 요소마다 하위 디렉토리로 분리
+        return "/".join(re.sub(r"[^a-zA-Z0-9_.\-]", "_", part) for part in parts) + "/"
+
+    def _create_document_embeddings(self, model_kwargs: Dict[str, Any]):
+        """청크 해시(blake2b) 기반 디스크 캐시로 감싼 문서 임베딩을 생성"""
+        if not settings.embedding_cache_directory:
+            return self.embeddings
+        if not EMBEDDING_CACHE_AVAILABLE:
+            logger.warning("CacheBackedEmbeddings를 사용할 수 없어 임베딩 캐시 없이 동작합니다.")
+            return self.embeddings
+        try:
+            os.makedirs(settings.embedding_cache_directory, exist_ok=True)
+            return CacheBackedEmbeddings.from_bytes_store(
+                self.embeddings,
+                LocalFileStore(settings.embedding_cache_directory),
+                # 모델이나 백엔드/양자화 파일/FP16 설정이 바뀌면 다른 네임스페이스를 쓰므로 이전 벡터가 섞이지 않음
+                namespace=self._embedding_cache_namespace(model_kwargs),
+                key_encoder="blake2b"
+            )
+        except Exception as e:
+            logger.warning(f"임베딩 캐시 초기화 실패, 캐시 없이 동작합니다: {e}")
+            return self.embeddings
+    
+    @staticmethod
+    def _get_document_type(file_extension: str) -> str:
         """파일 확장자로 문서 타입 결정"""
-        extension_mapping = {
-            '.pdf': 'pdf',
-            '.txt': 'text',
-            '.docx': 'word',  # .doc은 지원하지 않음
-            '.md': 'markdown',
-            '.xlsx': 'excel',
-            '.xls': 'excel',
-            '.csv': 'excel'
-        }
-        return extension_mapping.get(file_extension, 'unknown')
+        return _EXT_TO_DOCTYPE.get(file_extension, 'unknown')
     
+    def _split_text(self, content: str) -> List[str]:
+        """설정에 따라 문서를 토큰 창 또는 문자 단위로 분할"""
+        if self._chunk_tokenizer is None:
+            if self._rust_splitter is not None and len(content) >= settings.rust_splitter_min_chars:
+                chunks = self._rust_splitter.chunks(content)
+            else:
+                chunks = self.text_splitter.split_text(content)
+            if settings.chunk_regularize:
+                chunks = self._regularize_chunks(chunks)
+            return chunks
+
+        # 한 번만 인코딩하고 오프셋으로 원문을 잘라 내므로 decode에 의한 텍스트 변형(소문자화 등)이 없음
+        offsets = self._chunk_tokenizer(
+            content,
+            add_special_tokens=False,
+            return_offsets_mapping=True,
+            verbose=False
+        )["offset_mapping"]
+
+        size = settings.chunk_token_size
+        step = max(1, size - settings.chunk_token_overlap)
+        chunks = []
+        for start in range(0, len(offsets), step):
+            window = offsets[start:start + size]
+            chunks.append(content[window[0][0]:window[-1][1]])
+            if start + size >= len(offsets):
+                break
+        return chunks
+
+    def _regularize_chunks(self, chunks: List[str]) -> List[str]:
+        """분할 결과 후처리: 너무 긴 청크는 다시 분할하고, 너무 짧은 청크는 이웃과 병합"""
+        max_size = int(settings.chunk_size * 1.1)
+        merge_limit = int(settings.chunk_size * 1.05)
+        min_size = settings.chunk_size // 10
+
+        # 1단계: 구분자를 찾지 못해 커진 청크 재분할
+        resplit: List[str] = []
+        for chunk in chunks:
+            if len(chunk) > max_size:
+                resplit.extend(self.text_splitter.split_text(chunk))
+            else:
+                resplit.append(chunk)
+
+        # 2단계: 문맥이 부족한 짧은 조각(제목, 표 행 등)을 앞 청크에 붙이고,
+        # 앞 청크에 붙일 수 없으면 다음 청크와 합침
+        # 길이 배열만으로 병합 구간을 먼저 정하고 구간마다 join 한 번으로 합쳐
+        # 짧은 조각이 연달아 붙을 때 문자열을 반복 재생성하지 않음
+        group_starts: List[int] = []
+        group_length = 0
+        for i, length in enumerate(map(len, resplit)):
+            if group_starts and (length < min_size or group_length < min_size) \
+                    and group_length + length + 1 <= merge_limit:
+                group_length += length + 1
+            else:
+                group_starts.append(i)
+                group_length = length
+        group_starts.append(len(resplit))
+        merged = [
+            "\n".join(resplit[start:end]) if end - start > 1 else resplit[start]
+            for start, end in zip(group_starts, group_starts[1:])
+        ]
+
+        if len(merged) != len(chunks):
+            logger.debug(f"청크 정규화: {len(chunks)}개 -> {len(merged)}개")
+        return merged
+
     def _initialize_vectorstore(self):
         """벡터 저장소 초기화"""
         try:
+            # 재초기화(dev_reset 등) 시 이전 비동기 쓰기 루프/컬렉션을 먼저 정리
+            # (재연결이 실패해도 이전 컬렉션으로 쓰지 않고 동기 쓰기로 동작)
+            self._stop_async_writer()
+            
             # PostHog 텔레메트리 비활성화
             if not settings.chroma_anonymized_telemetry:
                 os.environ['CHROMA_ANONYMIZED_TELEMETRY'] = 'false'
@@ -96,6 +354,9 @@ class DocumentService:
                 embedding_function=self.embeddings,
                 collection_name=settings.chroma_collection_name
             )
+            self._invalidate_search_cache()
+            if settings.chroma_mode == "http" and settings.chroma_write_concurrency > 1:
+                self._start_async_writer()
             logger.info(f"벡터 저장소가 성공적으로 초기화되었습니다. (모드: {settings.chroma_mode})")
         except Exception as e:
             logger.error(f"벡터 저장소 초기화 실패: {e}")
@@ -113,17 +374,54 @@ class DocumentService:
                 settings=chromadb.config.Settings(**config["settings"])
             )
         elif config["mode"] == "http":
-            # HTTP 모드 (외부 서버)
+            # HTTP 모드 (외부 Chroma 서버) - 여러 uvicorn 워커가 sqlite 락 경합 없이 같은 컬렉션을 공유
             return chromadb.HttpClient(
                 host=config["host"],
                 port=config["port"],
-                username=config["username"],
-                password=config["password"],
-                ssl=config["ssl"]
+                ssl=config["ssl"],
+                settings=chromadb.config.Settings(**config["settings"])
             )
         else:
             raise ValueError(f"지원하지 않는 Chroma DB 모드입니다: {config['mode']}")
     
+    def _start_async_writer(self):
+        """http 모드: 전용 이벤트 루프 스레드에서 AsyncHttpClient 컬렉션을 준비 (실패 시 동기 쓰기 유지)"""
+        async def open_collection():
+            config = settings.get_chroma_client_config()
+            client = await chromadb.AsyncHttpClient(
+                host=config["host"],
+                port=config["port"],
+                ssl=config["ssl"],
+                settings=chromadb.config.Settings(**config["settings"])
+            )
+            return await client.get_collection(settings.chroma_collection_name)
+
+        loop = asyncio.new_event_loop()
+        threading.Thread(target=loop.run_forever, daemon=True, name="chroma-async-writer").start()
+        try:
+            self._async_collection = asyncio.run_coroutine_threadsafe(open_collection(), loop).result(timeout=30)
+            self._write_loop = loop
+            logger.info(f"Chroma 비동기 쓰기 활성화 (동시 배치 수: {settings.chroma_write_concurrency})")
+        except Exception as e:
+            loop.call_soon_threadsafe(loop.stop)
+            logger.warning(f"Chroma 비동기 쓰기 초기화 실패, 동기 쓰기를 사용합니다: {e}")
+    
+    def _stop_async_writer(self):
+        """비동기 쓰기 이벤트 루프를 멈추고 관련 속성을 비움 (동기 쓰기로 전환)"""
+        loop, self._write_loop, self._async_collection = self._write_loop, None, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+    
+    async def _async_upsert_batches(self, batches: List[Dict[str, Any]]):
+        """배치들을 최대 chroma_write_concurrency개씩 동시에 전송해 네트워크 대기를 겹침"""
+        semaphore = asyncio.Semaphore(settings.chroma_write_concurrency)
+
+        async def upsert(batch: Dict[str, Any]):
+            async with semaphore:
+                await self._async_collection.upsert(**batch)
+
+        await asyncio.gather(*(upsert(batch) for batch in batches))
+    
     def _start_processing_thread(self):
         """문서 처리 스레드 시작"""
         if self._processing_thread is None or not self._processing_thread.is_alive():
@@ -132,111 +430,263 @@ class DocumentService:
             logger.info("문서 처리 스레드가 시작되었습니다.")
     
     def _process_queue(self):
-        """큐에서 문서 처리 작업을 처리하는 스레드"""
+        """임베딩이 끝난 문서를 큐에서 꺼내 저장하는 단일 쓰기 스레드 (대기 중인 문서는 묶어서 저장)"""
         while not self._stop_processing:
-            try:
-                # 큐에서 작업 가져오기 (1초 타임아웃)
-                task = self._processing_queue.get(timeout=1)
-                if task is None:  # 종료 신호
-                    break
-                
-                content, filename, metadata, callback = task
+            # 작업이 올 때까지 블로킹 대기 (주기적으로 깨어나지 않으며 종료는 None 신호로 처리)
+            task = self._processing_queue.get()
+
+            if task is None:  # 종료 신호
+                self._processing_queue.task_done()
+                break
+
+            # 이미 쌓여 있는 작업만 추가로 꺼내므로 트래픽이 적을 때 지연이 늘지 않음
+            tasks = [task]
+            stop_after_batch = False
+            while len(tasks) < settings.document_batch_max_tasks:
                 try:
-                    # 실제 문서 처리 수행
-                    doc_id = self._process_document_sync(content, filename, metadata)
-                    if callback:
-                        callback(True, doc_id, None)
-                except Exception as e:
-                    logger.error(f"문서 처리 실패: {e}")
-                    if callback:
-                        callback(False, None, str(e))
-                finally:
+                    next_task = self._processing_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if next_task is None:
                     self._processing_queue.task_done()
-                    
-            except queue.Empty:
-                continue
+                    stop_after_batch = True
+                    break
+                tasks.append(next_task)
+
+            try:
+                self._write_task_batch(tasks)
             except Exception as e:
                 logger.error(f"큐 처리 중 오류: {e}")
+            finally:
+                for _ in tasks:
+                    self._processing_queue.task_done()
+
+            if stop_after_batch:
+                break
+
+    def _on_document_prepared(self, callback: Callable, future: Future):
+        """임베딩 풀 작업 완료 시 호출: 성공하면 쓰기 큐로 넘기고 실패하면 바로 콜백"""
+        try:
+            prepared = future.result()
+        except Exception as e:
+            logger.error(f"문서 처리 실패: {e}")
+            callback(False, None, str(e))
+            return
+        self._processing_queue.put((prepared, callback))
+
+    def _write_task_batch(self, tasks: List[Tuple[Dict[str, Any], Optional[Callable]]]):
+        """여러 업로드 작업의 청크를 한 번에 벡터 저장소에 저장하고 작업별 콜백을 호출"""
+        try:
+            with self._rw.gen_wlock():
+                self._write_prepared([prepared for prepared, _ in tasks])
+                self._invalidate_search_cache()
+        except Exception as e:
+            if len(tasks) == 1:
+                logger.error(f"문서 처리 실패: {e}")
+                _, callback = tasks[0]
+                if callback:
+                    callback(False, None, str(e))
+                return
+            # 묶음 저장이 실패하면 어느 문서가 원인인지 알 수 없으므로 문서별로 다시 저장
+            logger.warning(f"묶음 저장 실패, 문서별로 재시도합니다: {e}")
+            for prepared, callback in tasks:
+                try:
+                    with self._rw.gen_wlock():
+                        self._write_prepared([prepared])
+                        self._invalidate_search_cache()
+                    logger.info(f"문서 '{prepared['filename']}'이 {len(prepared['ids'])}개 청크로 처리되어 저장되었습니다.")
+                    if callback:
+                        callback(True, prepared["doc_id"], None)
+                except Exception as doc_error:
+                    logger.error(f"문서 처리 실패: {doc_error}")
+                    if callback:
+                        callback(False, None, str(doc_error))
+            return
+
+        for prepared, callback in tasks:
+            logger.info(f"문서 '{prepared['filename']}'이 {len(prepared['ids'])}개 청크로 처리되어 저장되었습니다.")
+            if callback:
+                callback(True, prepared["doc_id"], None)
+
+    def _embed_length_sorted(self, texts: List[str]) -> List[List[float]]:
+        """길이순으로 정렬해 임베딩한 뒤 원래 순서로 되돌립니다.
+
+        비슷한 길이의 청크가 같은 미니 배치에 모이므로 패딩 토큰 계산이 줄어듭니다.
+        """
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        sorted_vectors = self._document_embeddings.embed_documents([texts[i] for i in order])
+        vectors: List[List[float]] = [None] * len(texts)  # type: ignore[list-item]
+        for position, index in enumerate(order):
+            vectors[index] = sorted_vectors[position]
+        return vectors
+
+    def _write_prepared(self, prepared_list: List[Dict[str, Any]]):
+        """임베딩이 끝난 문서들을 chroma_batch_size 단위로 컬렉션에 저장 (호출자가 쓰기 락을 보유)"""
+        prepared_list = [prepared for prepared in prepared_list if prepared["ids"]]
+        if not prepared_list:
+            return
+        ids = [i for prepared in prepared_list for i in prepared["ids"]]
+        texts = [t for prepared in prepared_list for t in prepared["texts"]]
+        metadatas = [m for prepared in prepared_list for m in prepared["metadatas"]]
+        embeddings = np.concatenate([prepared["embeddings"] for prepared in prepared_list])
+
+        batch_size = max(1, settings.chroma_batch_size)
+        batches = [
+            {
+                "ids": ids[start:start + batch_size],
+                "documents": texts[start:start + batch_size],
+                "metadatas": metadatas[start:start + batch_size],
+                "embeddings": embeddings[start:start + batch_size],
+            }
+            for start in range(0, len(ids), batch_size)
+        ]
+        if self._write_loop is not None and len(batches) > 1:
+            asyncio.run_coroutine_threadsafe(self._async_upsert_batches(batches), self._write_loop).result()
+            return
+        for batch in batches:
+            self.vectorstore._collection.upsert(**batch)
+
+    def _base_metadata(self, doc_id: str, filename: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """문서의 모든 청크가 공유하는 기본 메타데이터"""
+        # 파일 확장자로 문서 타입 결정
+        file_extension = os.path.splitext(filename)[1].lower()
+        document_type = self._get_document_type(file_extension)
+        
+        # 기본 메타데이터 설정
+        base_metadata = {
+            "filename": filename,
+            "doc_id": doc_id,
+            "created_at": datetime.now().isoformat(),
+            "source": "upload",
+            "file_type": file_extension,
+            "document_type": document_type
+        }
+        
+        if metadata:
+            base_metadata.update(metadata)
+        return base_metadata
+    
+    def _prepare_chunks(self, doc_id: str, filename: str, base_metadata: Dict[str, Any],
+                        chunks: List[str], start_index: int = 0) -> Dict[str, Any]:
+        """청크를 임베딩해 저장 직전 상태로 만듭니다. (락 불필요)"""
+        return {
+            "doc_id": doc_id,
+            "filename": filename,
+            "ids": [str(uuid.uuid4()) for _ in chunks],
+            "texts": chunks,
+            # dict(base, k=v)는 단일 C 생성자 호출이라 {**base, ...} 병합보다 청크당 비용이 적음
+            "metadatas": [dict(base_metadata, chunk_index=i) for i in range(start_index, start_index + len(chunks))],
+            # add_documents는 도착 순서대로 임베딩하므로 직접 길이순 임베딩 후 컬렉션에 저장
+            # 쓰기 큐에서 대기하는 동안 Python float 리스트 대신 연속된 float32 배열로 보관 (Chroma 저장 형식과 동일)
+            "embeddings": np.asarray(self._embed_length_sorted(chunks), dtype=np.float32) if chunks else None,
+        }
+    
+    def _prepare_document(self, content: str, filename: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """분할과 임베딩까지 수행해 저장 직전 상태로 만듭니다. (락 불필요, 임베딩 풀에서 병렬 실행)"""
+        # 문서 ID 생성
+        doc_id = str(uuid.uuid4())
+        base_metadata = self._base_metadata(doc_id, filename, metadata)
+        
+        # 문서를 청크로 분할
+        chunks = self._split_text(content)
+        return self._prepare_chunks(doc_id, filename, base_metadata, chunks)
     
     def _process_document_sync(self, content: str, filename: str, metadata: Optional[Dict[str, Any]] = None) -> str:
         """동기 문서 처리 (내부용)"""
-        with self._write_lock:
-            # 문서 ID 생성
-            doc_id = str(uuid.uuid4())
-            
-            # 파일 확장자로 문서 타입 결정
-            file_extension = os.path.splitext(filename)[1].lower()
-            document_type = self._get_document_type(file_extension)
-            
-            # 기본 메타데이터 설정
-            base_metadata = {
-                "filename": filename,
-                "doc_id": doc_id,
-                "created_at": datetime.now().isoformat(),
-                "source": "upload",
-                "file_type": file_extension,
-                "document_type": document_type
-            }
-            
-            if metadata:
-                base_metadata.update(metadata)
-            
-            # 문서를 청크로 분할
-            chunks = self.text_splitter.split_text(content)
-            
-            # LangChain Document 객체 생성
-            documents = [
-                Document(
-                    page_content=chunk,
-                    metadata={**base_metadata, "chunk_index": i}
-                )
-                for i, chunk in enumerate(chunks)
-            ]
-            
-            # 벡터 저장소에 저장
-            self.vectorstore.add_documents(documents)
-            
-            logger.info(f"문서 '{filename}'이 {len(chunks)}개 청크로 처리되어 저장되었습니다.")
-            return doc_id
+        # 분할과 임베딩은 락 밖에서 수행하고 저장만 쓰기 락으로 보호
+        prepared = self._prepare_document(content, filename, metadata)
+        with self._rw.gen_wlock():
+            self._write_prepared([prepared])
+            self._invalidate_search_cache()
+        
+        logger.info(f"문서 '{filename}'이 {len(prepared['ids'])}개 청크로 처리되어 저장되었습니다.")
+        return prepared["doc_id"]
+    
+    def process_document_stream(self, sections: Iterable[str], filename: str,
+                                metadata: Optional[Dict[str, Any]] = None) -> str:
+        """페이지/시트 단위 텍스트를 순서대로 분할·저장 (문서 전체를 메모리에 올리지 않음)
+        
+        각 구간의 마지막 청크는 다음 구간과 이어 붙여 다시 분할하므로 구간 경계에서도
+        일반 분할과 같은 청크 겹침이 유지됩니다.
+        """
+        doc_id = str(uuid.uuid4())
+        base_metadata = self._base_metadata(doc_id, filename, metadata)
+        batch_size = max(1, settings.chroma_batch_size)
+        
+        pending = ""  # 다음 구간과 이어질 수 있는 마지막 청크
+        batch: List[str] = []
+        chunk_count = 0
+        
+        def write_batch(chunks: List[str]):
+            nonlocal chunk_count
+            prepared = self._prepare_chunks(doc_id, filename, base_metadata, chunks, chunk_count)
+            with self._rw.gen_wlock():
+                self._write_prepared([prepared])
+            chunk_count += len(chunks)
+        
+        try:
+            for section in sections:
+                chunks = self._split_text(f"{pending}\n\n{section}" if pending else section)
+                if not chunks:
+                    continue
+                pending = chunks.pop()
+                batch.extend(chunks)
+                while len(batch) >= batch_size:
+                    write_batch(batch[:batch_size])
+                    batch = batch[batch_size:]
+            if pending:
+                batch.append(pending)
+            if batch:
+                write_batch(batch)
+        except Exception:
+            # 일부만 저장된 문서가 남지 않도록 되돌림
+            if chunk_count:
+                with self._rw.gen_wlock():
+                    self.vectorstore._collection.delete(where={"doc_id": doc_id})
+            raise
+        finally:
+            if chunk_count:
+                self._invalidate_search_cache()
+        
+        logger.info(f"문서 '{filename}'이 {chunk_count}개 청크로 처리되어 저장되었습니다.")
+        return doc_id
+    
+    def load_document_stream(self, file_path: str) -> Iterator[str]:
+        """문서를 페이지(PDF)/시트(엑셀) 단위로 로드 (그 외 형식은 전체 텍스트 한 구간)"""
+        file_extension = os.path.splitext(file_path)[1].lower()
+        if file_extension == '.pdf':
+            return pdf_processor.iter_pdf_pages(file_path)
+        if file_extension in ['.xlsx', '.xls', '.csv']:
+            return excel_processor.iter_excel_sections(file_path)
+        return iter([self.load_document(file_path)])
+    
+    def _load_txt(self, file_path: str) -> str:
+        """텍스트 파일 로드"""
+        documents = TextLoader(file_path, encoding='utf-8').load()
+        return "\n".join([doc.page_content for doc in documents])
+    
+    def _load_md(self, file_path: str) -> str:
+        """마크다운 파일 로드"""
+        documents = UnstructuredMarkdownLoader(file_path).load()
+        return "\n".join([doc.page_content for doc in documents])
+    
+    @staticmethod
+    def _reject_doc(file_path: str) -> str:
+        """.doc 형식은 명시적으로 차단"""
+        raise ValueError(".doc 형식은 지원하지 않습니다. .docx로 변환 후 업로드해주세요.")
     
     def load_document(self, file_path: str) -> str:
         """문서 로드"""
         file_extension = os.path.splitext(file_path)[1].lower()
         
         try:
-            if file_extension == '.pdf':
-                # 개선된 PDF 전처리 프로세서 사용
-                logger.info(f"PDF 파일 전처리 시작: {file_path}")
-                processed_content = pdf_processor.process_pdf_file(file_path)
-                logger.info(f"PDF 파일 전처리 완료: {file_path} (길이: {len(processed_content)} 문자)")
-                return processed_content
-            elif file_extension == '.txt':
-                loader = TextLoader(file_path, encoding='utf-8')
-                documents = loader.load()
-                return "\n".join([doc.page_content for doc in documents])
-            elif file_extension == '.docx':
-                # 워드 텍스트 추출 프로세서 사용
-                logger.info(f"워드 파일 텍스트 추출 시작: {file_path}")
-                processed_content = word_processor.extract_text_from_word(file_path)
-                logger.info(f"워드 파일 텍스트 추출 완료: {file_path} (길이: {len(processed_content)} 문자)")
-                return processed_content
-            elif file_extension == '.doc':
-                # 명시적으로 차단
-                raise ValueError(".doc 형식은 지원하지 않습니다. .docx로 변환 후 업로드해주세요.")
-
-            elif file_extension == '.md':
-                loader = UnstructuredMarkdownLoader(file_path)
-                documents = loader.load()
-                return "\n".join([doc.page_content for doc in documents])
-            elif file_extension in ['.xlsx', '.xls', '.csv']:
-                # 엑셀 텍스트 추출 프로세서 사용
-                logger.info(f"엑셀 파일 텍스트 추출 시작: {file_path}")
-                processed_content = excel_processor.extract_text_from_excel(file_path)
-                logger.info(f"엑셀 파일 텍스트 추출 완료: {file_path} (길이: {len(processed_content)} 문자)")
-                return processed_content
-            else:
+            loader = self._loaders.get(file_extension)
+            if loader is None:
                 raise ValueError(f"지원하지 않는 파일 형식: {file_extension}")
-        
+            logger.info(f"문서 텍스트 추출 시작: {file_path}")
+            content = loader(file_path)
+            logger.info(f"문서 텍스트 추출 완료: {file_path} (길이: {len(content)} 문자)")
+            return content
         except Exception as e:
             logger.error(f"문서 로드 실패: {e}")
             raise
@@ -246,20 +696,72 @@ class DocumentService:
         """문서 처리 및 벡터 저장소에 저장 (비동기 처리 지원)"""
         # 콜백이 제공된 경우 비동기 처리
         if callback:
-            # 큐에 작업 추가
-            self._processing_queue.put((content, filename, metadata, callback))
+            # 분할/임베딩은 풀에서 병렬로, 저장은 쓰기 스레드가 큐를 통해 순서대로 처리
+            future = self._embed_pool.submit(self._prepare_document, content, filename, metadata)
+            future.add_done_callback(partial(self._on_document_prepared, callback))
             return "processing"  # 처리 중임을 나타내는 ID
         
         # 콜백이 없는 경우 동기 처리 (기존 방식)
         return self._process_document_sync(content, filename, metadata)
     
+    def _invalidate_search_cache(self):
+        """벡터 저장소 변경 시 검색 결과 캐시를 비웁니다."""
+        with self._search_cache_lock:
+            self._search_cache_generation += 1
+            self._search_cache.clear()
+
+    def _embed_query(self, query: str) -> List[float]:
+        """쿼리 임베딩 (같은 쿼리는 캐시에서 반환 - 필터/top_k를 바꿔 다시 검색해도 재계산하지 않음)"""
+        if settings.query_embedding_cache_size > 0:
+            with self._query_embedding_cache_lock:
+                cached = self._query_embedding_cache.get(query)
+                if cached is not None:
+                    self._query_embedding_cache.move_to_end(query)
+                    return cached
+
+        if self._query_batcher is not None:
+            embedding = self._query_batcher.embed(query)
+        else:
+            embedding = self.embeddings.embed_query(query)
+
+        if settings.query_embedding_cache_size > 0:
+            with self._query_embedding_cache_lock:
+                self._query_embedding_cache[query] = embedding
+                if len(self._query_embedding_cache) > settings.query_embedding_cache_size:
+                    self._query_embedding_cache.popitem(last=False)
+        return embedding
+
+    @staticmethod
+    def _copy_search_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """검색 결과 복사 (중첩된 metadata dict까지 복사, Chroma 메타데이터 값은 스칼라라 한 단계면 충분)"""
+        return [dict(r, metadata=dict(r["metadata"])) for r in results]
+
     def search_documents(self, query: str, top_k: int = 5, filter_metadata: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """문서 검색 (스레드 안전)"""
-        with self._read_lock:  # 읽기 작업 시 락 획득
+        """문서 검색 (스레드 안전, 동일 검색은 캐시에서 반환)"""
+        cache_key = (query, top_k, repr(filter_metadata))
+        if settings.search_cache_size > 0:
+            with self._search_cache_lock:
+                generation = self._search_cache_generation
+                cached = self._search_cache.get(cache_key)
+                if cached is not None:
+                    if cached[0] > time.monotonic():
+                        self._search_cache.move_to_end(cache_key)
+                        # 호출자가 결과 dict를 수정해도 캐시가 오염되지 않도록 복사
+                        return self._copy_search_results(cached[1])
+                    del self._search_cache[cache_key]
+
+        try:
+            # 쿼리 임베딩은 락 밖에서 계산해 동시 검색끼리 배치로 묶일 수 있게 함
+            query_embedding = self._embed_query(query)
+        except Exception as e:
+            logger.error(f"문서 검색 실패: {e}")
+            return []
+
+        with self._rw.gen_rlock():  # 읽기 작업 시 락 획득
             try:
-                # 벡터 저장소에서 유사한 문서 검색
-                results = self.vectorstore.similarity_search_with_score(
-                    query, 
+                # 벡터 저장소에서 유사한 문서 검색 (similarity_search_with_score와 동일한 거리 점수)
+                results = self.vectorstore.similarity_search_by_vector_with_relevance_scores(
+                    query_embedding,
                     k=top_k,
                     filter=filter_metadata
                 )
@@ -274,15 +776,26 @@ class DocumentService:
                         "score": float(score)
                     })
                 
-                return formatted_results
-                
             except Exception as e:
                 logger.error(f"문서 검색 실패: {e}")
                 return []
+
+        if settings.search_cache_size > 0:
+            with self._search_cache_lock:
+                # 검색 도중 쓰기가 있었다면 낡은 결과이므로 저장하지 않음
+                if generation == self._search_cache_generation:
+                    self._search_cache[cache_key] = (
+                        time.monotonic() + settings.search_cache_ttl,
+                        self._copy_search_results(formatted_results)
+                    )
+                    if len(self._search_cache) > settings.search_cache_size:
+                        self._search_cache.popitem(last=False)
+
+        return formatted_results
     
     def get_document_count(self) -> int:
         """저장된 문서 수 반환 (스레드 안전)"""
-        with self._read_lock:  # 읽기 작업 시 락 획득
+        with self._rw.gen_rlock():  # 읽기 작업 시 락 획득
             try:
                 return self.vectorstore._collection.count()
             except Exception as e:
@@ -293,45 +806,59 @@ class DocumentService:
         """모든 문서 정보 반환 (스레드 안전)
         - 벡터스토어의 실제 문서 ID(ids)를 포함해 반환
         - 메타데이터에 filename이 없고 file_name만 있는 경우도 보완
+        - 컬렉션이 큰 경우 전체를 리스트로 만들지 않는 iter_all_documents 사용 권장
         """
-        with self._read_lock:  # 읽기 작업 시 락 획득
-            try:
-                results = self.vectorstore._collection.get()
-
-                documents: List[Dict[str, Any]] = []
-                if results and 'metadatas' in results:
-                    ids = results.get('ids', [])
-                    metadatas = results['metadatas']
-                    for i, metadata in enumerate(metadatas):
-                        if metadata is None:
-                            continue
-                        chroma_id = ids[i] if i < len(ids) else f"doc_{i}"
-                        filename = metadata.get("filename") or metadata.get("file_name") or "unknown"
-                        documents.append({
-                            "id": chroma_id,  # 벡터스토어 실제 ID
-                            "metadata_doc_id": metadata.get("doc_id"),  # 앱 내부에서 부여한 문서 ID(있을 수도, 없을 수도)
-                            "filename": filename,
-                            "source": metadata.get("source", "unknown"),
-                            "file_type": metadata.get("file_type", "unknown"),
-                            "file_size": metadata.get("file_size", 0),
-                            "metadata": metadata
-                        })
-
-                return documents
-
-            except Exception as e:
-                logger.error(f"모든 문서 조회 실패: {e}")
-                return []
+        try:
+            return list(self.iter_all_documents())
+        except Exception as e:
+            logger.error(f"모든 문서 조회 실패: {e}")
+            return []
+    
+    def iter_all_documents(self, page_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """모든 문서 정보를 페이지 단위로 조회해 하나씩 반환 (메모리 사용량이 컬렉션 크기와 무관)
+        - 읽기 락은 페이지 조회 동안만 잡으므로 긴 조회 중에도 쓰기가 밀리지 않음
+        - 조회 도중 추가/삭제가 있으면 페이지 경계의 항목이 누락되거나 중복될 수 있음
+        """
+        offset = 0
+        while True:
+            with self._rw.gen_rlock():  # 읽기 작업 시 락 획득
+                results = self.vectorstore._collection.get(
+                    limit=page_size,
+                    offset=offset,
+                    include=["metadatas"]
+                )
+            ids = results.get('ids') or []
+            if not ids:
+                return
+            metadatas = results.get('metadatas') or []
+            for i, metadata in enumerate(metadatas):
+                if metadata is None:
+                    continue
+                chroma_id = ids[i] if i < len(ids) else f"doc_{offset + i}"
+                filename = metadata.get("filename") or metadata.get("file_name") or "unknown"
+                yield {
+                    "id": chroma_id,  # 벡터스토어 실제 ID
+                    "metadata_doc_id": metadata.get("doc_id"),  # 앱 내부에서 부여한 문서 ID(있을 수도, 없을 수도)
+                    "filename": filename,
+                    "source": metadata.get("source", "unknown"),
+                    "file_type": metadata.get("file_type", "unknown"),
+                    "file_size": metadata.get("file_size", 0),
+                    "metadata": metadata
+                }
+            if len(ids) < page_size:
+                return
+            offset += page_size
     
     def delete_document(self, doc_id: str) -> bool:
         """문서 삭제 (스레드 안전)
         - 우선 벡터스토어의 실제 ID(ids) 기준으로 삭제 시도
         - 실패 시 메타데이터의 doc_id(where) 기준으로 폴백 삭제
         """
-        with self._write_lock:  # 쓰기 작업 시 락 획득
+        with self._rw.gen_wlock():  # 쓰기 작업 시 락 획득
             # 1) 실제 ID로 삭제
             try:
                 self.vectorstore._collection.delete(ids=[doc_id])
+                self._invalidate_search_cache()
                 logger.info(f"벡터스토어 ID 기준 문서 삭제 완료: {doc_id}")
                 return True
             except Exception as e:
@@ -339,6 +866,7 @@ class DocumentService:
             # 2) 메타데이터의 doc_id로 삭제
             try:
                 self.vectorstore._collection.delete(where={"doc_id": doc_id})
+                self._invalidate_search_cache()
                 logger.info(f"메타데이터 doc_id 기준 문서 삭제 완료: {doc_id}")
                 return True
             except Exception as e:
@@ -350,8 +878,10 @@ class DocumentService:
         - 메타데이터 키가 'filename' 또는 'file_name'일 수 있어 각각 삭제 시도 후 합산
         - 결과 반환값은 드라이버에 따라 None일 수 있으므로 보수적으로 처리
         """
-        with self._write_lock:  # 쓰기 작업 시 락 획득
+        with self._rw.gen_wlock():  # 쓰기 작업 시 락 획득
             total_deleted = 0
+            # 일부 삭제만 성공해도 캐시가 낡으므로 먼저 무효화
+            self._invalidate_search_cache()
             try:
                 # 1) filename 키 기준 삭제
                 try:
@@ -377,12 +907,25 @@ class DocumentService:
     
     def get_vectorstore_status(self) -> str:
         """벡터 저장소 상태 확인 (스레드 안전)"""
-        with self._read_lock:  # 읽기 작업 시 락 획득
-            try:
-                count = self.get_document_count()
-                return f"active ({count} documents)"
-            except Exception as e:
-                return f"error: {str(e)}"
+        # get_document_count가 읽기 락을 잡으므로 여기서 다시 잡지 않음 (락은 재진입 불가)
+        try:
+            count = self.get_document_count()
+            return f"active ({count} documents)"
+        except Exception as e:
+            return f"error: {str(e)}"
+
+    async def run_in_executor(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """블로킹 벡터 저장소 작업을 전용 스레드 풀에서 실행하고 결과를 기다립니다."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._vectorstore_executor, partial(func, *args, **kwargs))
+
+    async def asearch_documents(self, query: str, top_k: int = 5, filter_metadata: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """search_documents의 비동기 버전 (이벤트 루프를 막지 않음)"""
+        return await self.run_in_executor(self.search_documents, query, top_k, filter_metadata)
+
+    async def aget_vectorstore_status(self) -> str:
+        """get_vectorstore_status의 비동기 버전 (이벤트 루프를 막지 않음)"""
+        return await self.run_in_executor(self.get_vectorstore_status)
 
     def get_queue_status(self) -> Dict[str, Any]:
         """큐 상태 확인"""
@@ -407,6 +950,8 @@ class DocumentService:
     def shutdown(self):
         """서비스 종료"""
         try:
+            # 아직 시작하지 않은 임베딩 작업은 취소
+            self._embed_pool.shutdown(wait=False, cancel_futures=True)
             self._stop_processing = True
             # 종료 신호 전송
             self._processing_queue.put(None)
@@ -415,9 +960,23 @@ class DocumentService:
             if self._processing_thread and self._processing_thread.is_alive():
                 self._processing_thread.join(timeout=5)
             
+            self._stop_async_writer()
+            
+            # 진행 중인 조회는 마저 끝내되 종료를 막지 않음
+            self._vectorstore_executor.shutdown(wait=False)
+            
             logger.info("DocumentService가 종료되었습니다.")
         except Exception as e:
             logger.error(f"DocumentService 종료 실패: {e}")
 
-# 싱글톤 인스턴스
-document_service = DocumentService() 
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_document_service() -> DocumentService:
+    """DocumentService 싱글톤 반환 (모델 로드/Chroma 연결은 첫 호출 시점에 수행)"""
+    return DocumentService()
+
+
+def __getattr__(name: str) -> Any:
+    # 기존 `from src.services.document_service import document_service` 호환
+    if name == "document_service":
+        return get_document_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}") 
\ No newline at end of file
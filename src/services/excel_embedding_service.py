@@ -3,11 +3,15 @@
 RAG 워크플로우를 통한 엑셀 문서 처리 및 임베딩 생성
 """
 
+import hashlib
 import logging
 import re
 import os
+import threading
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, Tuple
 from dataclasses import dataclass
 import tiktoken
 
@@ -22,8 +26,15 @@ except ImportError:
     KONLPY_AVAILABLE = False
     logging.warning("KoNLPy가 설치되지 않았습니다. 기본 텍스트 처리만 사용합니다.")
 
+# 청크 ID용 고속 비암호 해시 (선택적, 없으면 hashlib.blake2b 사용)
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
 # 임베딩 및 벡터 DB
-from sentence_transformers import SentenceTransformer
+from src.utils.embedding_models import get_sentence_transformer, get_static_embedding_model
 import chromadb
 from chromadb.config import Settings
 
@@ -36,6 +47,14 @@ from src.services.excel_processor import excel_processor
 logger = logging.getLogger(__name__)
 
 
+def _content_hash(text: str) -> str:
+    """청크 내용의 64비트 해시 (내용 기반 청크 ID용)"""
+    data = text.encode('utf-8')
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_64_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
 @dataclass
 class ExcelChunk:
     """엑셀 청크 정보"""
@@ -50,11 +69,38 @@ class ExcelChunk:
 class ExcelEmbeddingService:
     """엑셀 파일 임베딩 서비스"""
     
+    # preprocess_text용 변환 테이블/정규식 (호출마다 다시 컴파일하지 않도록 클래스 수준에 정의)
+    _CHAR_UNIFY_TABLE = str.maketrans({'—': '-', '–': '-', '−': '-', '·': '•', '∙': '•'})
+    _UNWANTED_CHARS_PATTERN = re.compile(r'[^\w\s\.,!?;:()\-_가-힣•"\'"]')
+    _WHITESPACE_PATTERN = re.compile(r'\s+')
+    _REPEATED_PUNCT_PATTERN = re.compile(r'[.,!?;:]{2,}')
+    _SPACE_BEFORE_PUNCT_PATTERN = re.compile(r'\s+([.,!?;:])')
+    _BRACKET_SPACE_PATTERN = re.compile(r'\(\s+|\s+\)')
+    
+    # 형태소 분석에서 남길 품사 (집합 조회로 토큰마다 리스트를 훑지 않음)
+    _OKT_KEY_POS = frozenset(('Noun', 'Verb', 'Adjective', 'Adverb'))
+    _MECAB_KEY_POS = ('NNG', 'NNP', 'VV', 'VA', 'MAG')  # str.startswith용 튜플
+    _KOMORAN_KEY_POS = frozenset(('NNG', 'NNP', 'VV', 'VA', 'MAG'))
+    _SENTENCE_BOUNDARY_PATTERN = re.compile(r'(?<=[.!?])\s+')
+    _ANALYSIS_SEGMENT_SIZE = 500
+    # 여러 행을 한 번에 분석할 때 행 경계 표시 (_UNWANTED_CHARS_PATTERN이 지우는 문자라 전처리된 행에는 없음)
+    _ROW_SEPARATOR = '¶'
+    
+    # 시트 머리말("=== 시트: 이름 ===")과 다음 머리말 전까지의 내용
+    _SHEET_PATTERN = re.compile(r'=== 시트: ([^\n]+?) ===\n(.*?)(?=\n=== 시트: |\Z)', re.DOTALL)
+    
+    # store_embeddings에서 한 번의 collection.add로 보낼 최대 청크 수
+    _STORE_BATCH_SIZE = 5000
+    
+    # 문서 간 청크 임베딩 캐시 최대 항목 수 (blake2b 해시 -> 벡터)
+    _EMBED_CACHE_SIZE = 10000
+    
     def __init__(self, 
                  embedding_model_name: str = None,
                  chunk_size: int = None,
                  chunk_overlap: int = None,
-                 vector_db_path: str = None):
+                 vector_db_path: str = None,
+                 encode_batch_size: int = None):
         """
         엑셀 임베딩 서비스 초기화
         
@@ -63,15 +109,36 @@ class ExcelEmbeddingService:
             chunk_size: 청크 크기 (토큰 수)
             chunk_overlap: 청크 간 겹침 (토큰 수)
             vector_db_path: 벡터 DB 저장 경로
+            encode_batch_size: 임베딩 배치 크기 (GPU에서는 크게 설정)
         """
         # 설정에서 기본값 가져오기
         self.embedding_model_name = embedding_model_name or settings.embedding_model_name
         self.chunk_size = chunk_size or settings.chunk_size
         self.chunk_overlap = chunk_overlap or settings.chunk_overlap
         self.vector_db_path = vector_db_path or settings.chroma_persist_directory
+        self.encode_batch_size = encode_batch_size or settings.embedding_batch_size
+        
+        # 반복 업로드/공통 셀 내용의 임베딩 재사용 캐시
+        self._embed_cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._embed_cache_lock = threading.Lock()
         
         # 임베딩 모델 초기화
-        self.embedding_model = SentenceTransformer(embedding_model_name)
+        self.collection_name = settings.chroma_collection_name
+        self.embedding_model = None
+        if settings.excel_embedding_backend == "static":
+            # model2vec 정적 임베딩: 토큰 벡터 조회 + 평균 풀링 (트랜스포머 추론 없음)
+            try:
+                self.embedding_model = get_static_embedding_model(settings.static_embedding_model_name)
+                self.embedding_model_name = settings.static_embedding_model_name
+                self.collection_name = settings.excel_static_collection_name
+            except ImportError:
+                logger.warning("model2vec가 설치되지 않았습니다. 트랜스포머 임베딩 모델을 사용합니다.")
+        if self.embedding_model is None:
+            # use_int8_onnx면 ONNX int8 양자화 모델 (CPU 추론 2~3배), encode API는 동일
+            self.embedding_model = get_sentence_transformer(
+                self.embedding_model_name,
+                int8_onnx=settings.use_int8_onnx
+            )
         
         # 벡터 DB 초기화
         self._init_vector_db()
@@ -89,11 +156,16 @@ class ExcelEmbeddingService:
             self.chroma_client = self._create_chroma_client()
             
             # 엑셀 문서용 컬렉션 생성
+            # 공유 컬렉션은 기존 데이터와 점수가 바뀌지 않도록 L2 유지 (단위 벡터라 순위는 코사인과 동일)
+            # 정적 임베딩 전용 컬렉션은 새로 만들어지므로 코사인 거리 사용
+            collection_metadata = dict(settings.chroma_collection_metadata)
+            if self.collection_name != settings.chroma_collection_name:
+                collection_metadata["hnsw:space"] = "cosine"
             self.collection = self.chroma_client.get_or_create_collection(
-                name=settings.chroma_collection_name,
-                metadata=settings.chroma_collection_metadata
+                name=self.collection_name,
+                metadata=collection_metadata
             )
-            logger.info(f"엑셀 벡터 DB 초기화 완료 (모드: {settings.chroma_mode})")
+            logger.info(f"엑셀 벡터 DB 초기화 완료 (모드: {settings.chroma_mode}, 컬렉션: {self.collection_name})")
             
         except Exception as e:
             logger.error(f"엑셀 벡터 DB 초기화 실패: {e}")
@@ -115,41 +187,48 @@ class ExcelEmbeddingService:
             return chromadb.HttpClient(
                 host=config["host"],
                 port=config["port"],
-                username=config["username"],
-                password=config["password"],
-                ssl=config["ssl"]
+                ssl=config["ssl"],
+                settings=chromadb.config.Settings(**config["settings"])
             )
         else:
             raise ValueError(f"지원하지 않는 Chroma DB 모드입니다: {config['mode']}")
     
     def _init_korean_analyzers(self):
-        """한국어 형태소 분석기 초기화"""
+        """한국어 형태소 분석기 설정 (JVM을 띄우는 분석기 생성은 처음 사용할 때까지 미룸)"""
         self.analyzers = {}
+        self._active_analyzer: Optional[Tuple[str, Any]] = None  # (이름, 분석기)
+        self._analyzer_resolved = False
+        self._analyzer_lock = threading.Lock()
         
         if not KONLPY_AVAILABLE:
             logger.warning("KoNLPy를 사용할 수 없습니다. 기본 텍스트 처리만 사용합니다.")
-            return
-        
-        try:
-            # Okt (Open Korean Text) - 가장 안정적
-            self.analyzers['okt'] = Okt()
-            logger.info("Okt 형태소 분석기 초기화 완료")
-        except Exception as e:
-            logger.warning(f"Okt 초기화 실패: {e}")
-        
-        try:
-            # Mecab - 가장 빠르고 정확
-            self.analyzers['mecab'] = Mecab()
-            logger.info("Mecab 형태소 분석기 초기화 완료")
-        except Exception as e:
-            logger.warning(f"Mecab 초기화 실패: {e}")
+            self._analyzer_resolved = True
+    
+    def _get_analyzer(self) -> Optional[Tuple[str, Any]]:
+        """
+        사용할 형태소 분석기 반환 (처음 호출 시 우선순위대로 생성해 처음 성공한 하나만 유지)
         
-        try:
-            # Komoran - 형태소 분석에 특화
-            self.analyzers['komoran'] = Komoran()
-            logger.info("Komoran 형태소 분석기 초기화 완료")
-        except Exception as e:
-            logger.warning(f"Komoran 초기화 실패: {e}")
+        Returns:
+            (분석기 이름, 분석기) 또는 사용할 수 있는 분석기가 없으면 None
+        """
+        if self._analyzer_resolved:
+            return self._active_analyzer
+        
+        with self._analyzer_lock:
+            if not self._analyzer_resolved:
+                # Okt(가장 안정적) -> Mecab(가장 빠름) -> Komoran 순서
+                for name, analyzer_class in (('okt', Okt), ('mecab', Mecab), ('komoran', Komoran)):
+                    try:
+                        analyzer = analyzer_class()
+                    except Exception as e:
+                        logger.warning(f"{analyzer_class.__name__} 초기화 실패: {e}")
+                        continue
+                    self.analyzers[name] = analyzer
+                    self._active_analyzer = (name, analyzer)
+                    logger.info(f"{analyzer_class.__name__} 형태소 분석기 초기화 완료")
+                    break
+                self._analyzer_resolved = True
+        return self._active_analyzer
     
     def extract_text_from_excel(self, file_path: str) -> str:
         """
@@ -173,48 +252,76 @@ class ExcelEmbeddingService:
         Returns:
             전처리된 텍스트
         """
-        # 1. 기본 정제
-        # 줄 바꿈, 탭을 공백으로 변환
-        text = re.sub(r'[\n\t\r]+', ' ', text)
+        text = self._clean_text(text)
         
-        # 2. 특수 문자 정제
-        # 다양한 대시 문자를 하이픈으로 통일
-        text = re.sub(r'[—–−]', '-', text)
-        
-        # 다양한 불릿 문자 통일
-        text = re.sub(r'[•·∙]', '•', text)
-        
-        # 다양한 따옴표 통일
-        text = re.sub(r'[""""]', '"', text)
-        text = re.sub(r"[''']", "'", text)
+        # 8. 한국어 형태소 분석을 통한 주요 품사 추출
+        if self._get_analyzer() is not None:
+            text = self._extract_key_pos(text)
         
-        # 기타 특수 문자 제거 (한글, 영문, 숫자, 기본 문장부호 제외)
-        text = re.sub(r'[^\w\s\.,!?;:()\-_가-힣•"\'"]', ' ', text)
+        return text
+    
+    def preprocess_rows(self, rows: List[str]) -> List[str]:
+        """
+        여러 행을 전처리 (행마다 preprocess_text를 적용한 것과 같은 형식)
         
-        # 3. 반복된 공백 제거
-        text = re.sub(r'\s+', ' ', text)
+        형태소 분석은 행마다 호출하지 않고, 행 경계 표시로 이어 붙인 묶음(_ANALYSIS_SEGMENT_SIZE 이하)마다
+        한 번씩 호출한 뒤 행 단위로 되돌립니다. 분석 결과에서 행 경계를 찾지 못한 묶음만 행마다 다시 분석합니다.
         
-        # 4. 앞뒤 공백 제거
-        text = text.strip()
+        Args:
+            rows: 원본 행 텍스트 목록
+            
+        Returns:
+            행 순서대로 전처리된 텍스트 목록 (내용이 없는 행은 빈 문자열)
+        """
+        cleaned = [self._clean_text(row) for row in rows]
+        active = self._get_analyzer()
+        if active is None:
+            return cleaned
+        
+        # 내용이 있는 행을 순서대로 묶음으로 나눔 (긴 행은 혼자 한 묶음이 되어 기존처럼 구간 분할됨)
+        separator_length = len(self._ROW_SEPARATOR) + 2
+        groups: List[List[int]] = []
+        group_length = 0
+        for i, row in enumerate(cleaned):
+            if not row:
+                continue
+            if not groups or group_length + len(row) + separator_length > self._ANALYSIS_SEGMENT_SIZE:
+                groups.append([])
+                group_length = 0
+            groups[-1].append(i)
+            group_length += len(row) + separator_length
+        
+        processed = [''] * len(cleaned)
+        for group in groups:
+            if len(group) == 1:
+                processed[group[0]] = self._extract_key_pos(cleaned[group[0]])
+                continue
+            for i, row_words in zip(group, self._extract_key_pos_rows(active, [cleaned[i] for i in group])):
+                processed[i] = row_words
+        return processed
+    
+    def _clean_text(self, text: str) -> str:
+        """형태소 분석 전 단계의 문자/공백/문장부호 정리"""
+        # 1. 특수 문자 통일 (대시 -> 하이픈, 불릿 -> •): 정규식 대신 translate 한 번으로 처리
+        text = text.translate(self._CHAR_UNIFY_TABLE)
         
-        # 5. 연속된 문장부호 정리
-        text = re.sub(r'[.,!?;:]{2,}', lambda m: m.group()[0], text)
+        # 2. 기타 특수 문자 제거 (한글, 영문, 숫자, 기본 문장부호 제외)
+        text = self._UNWANTED_CHARS_PATTERN.sub(' ', text)
         
-        # 6. 공백과 문장부호 사이 정리
-        text = re.sub(r'\s+([.,!?;:])', r'\1', text)
+        # 3. 반복된 공백 제거 (줄 바꿈, 탭 포함) 및 앞뒤 공백 제거
+        text = self._WHITESPACE_PATTERN.sub(' ', text).strip()
         
-        # 7. 괄호 내부 공백 정리
-        text = re.sub(r'\(\s+', '(', text)
-        text = re.sub(r'\s+\)', ')', text)
+        # 4. 연속된 문장부호 정리
+        text = self._REPEATED_PUNCT_PATTERN.sub(lambda m: m.group()[0], text)
         
-        # 8. 최종 정리
-        text = text.strip()
+        # 5. 공백과 문장부호 사이 정리
+        text = self._SPACE_BEFORE_PUNCT_PATTERN.sub(r'\1', text)
         
-        # 9. 한국어 형태소 분석을 통한 주요 품사 추출
-        if self.analyzers:
-            text = self._extract_key_pos(text)
+        # 6. 괄호 내부 공백 정리
+        text = self._BRACKET_SPACE_PATTERN.sub(lambda m: m.group().strip(), text)
         
-        return text
+        # 7. 최종 정리
+        return text.strip()
     
     def _extract_key_pos(self, text: str) -> str:
         """
@@ -227,86 +334,107 @@ class ExcelEmbeddingService:
             주요 품사가 추출된 텍스트
         """
         try:
-            # Okt 사용 (가장 안정적)
-            if 'okt' in self.analyzers:
-                okt = self.analyzers['okt']
-                pos_result = okt.pos(text, norm=True, stem=True)
-                
-                # 주요 품사만 추출 (명사, 동사, 형용사, 부사)
-                key_words = []
-                for word, pos in pos_result:
-                    if pos in ['Noun', 'Verb', 'Adjective', 'Adverb']:
-                        key_words.append(word)
-                
-                return ' '.join(key_words)
-            
-            # Mecab 사용 (더 정확)
-            elif 'mecab' in self.analyzers:
-                mecab = self.analyzers['mecab']
-                pos_result = mecab.pos(text)
-                
-                # 주요 품사만 추출
-                key_words = []
-                for word, pos in pos_result:
-                    if pos.startswith(('NNG', 'NNP', 'VV', 'VA', 'MAG')):  # 명사, 동사, 형용사, 부사
-                        key_words.append(word)
-                
-                return ' '.join(key_words)
-            
-            # Komoran 사용
-            elif 'komoran' in self.analyzers:
-                komoran = self.analyzers['komoran']
-                pos_result = komoran.pos(text)
-                
-                # 주요 품사만 추출
-                key_words = []
-                for word, pos in pos_result:
-                    if pos in ['NNG', 'NNP', 'VV', 'VA', 'MAG']:  # 명사, 동사, 형용사, 부사
-                        key_words.append(word)
-                
-                return ' '.join(key_words)
-            
-            else:
+            active = self._get_analyzer()
+            if active is None:
                 return text
+            name, analyzer = active
+            
+            # Okt는 문장 단위 구간으로 나눠 분석 (아주 긴 입력을 한 번에 넘기지 않음)
+            segments = self._split_for_analysis(text) if name == 'okt' else [text]
+            key_words = [
+                word
+                for segment in segments
+                for word, pos in self._pos(name, analyzer, segment)
+                if self._is_key_pos(name, pos)  # 명사, 동사, 형용사, 부사
+            ]
+            return ' '.join(key_words)
                 
         except Exception as e:
             logger.warning(f"형태소 분석 실패: {e}")
             return text
     
+    def _extract_key_pos_rows(self, active: Tuple[str, Any], rows: List[str]) -> List[str]:
+        """
+        여러 행을 행 경계 표시로 이어 붙여 한 번에 형태소 분석한 뒤 행별 주요 품사 텍스트로 분리
+        
+        행 경계 표시 수가 맞지 않으면(분석기가 표시를 합치거나 바꾼 경우) 행마다 다시 분석합니다.
+        """
+        name, analyzer = active
+        try:
+            tagged = self._pos(name, analyzer, f" {self._ROW_SEPARATOR} ".join(rows))
+        except Exception as e:
+            logger.warning(f"형태소 분석 실패: {e}")
+            tagged = None
+        
+        if tagged is not None:
+            key_words: List[List[str]] = [[]]
+            for word, pos in tagged:
+                if word == self._ROW_SEPARATOR:
+                    key_words.append([])
+                elif self._is_key_pos(name, pos):
+                    key_words[-1].append(word)
+            if len(key_words) == len(rows):
+                return [' '.join(words) for words in key_words]
+        
+        return [self._extract_key_pos(row) for row in rows]
+    
+    @staticmethod
+    def _pos(name: str, analyzer: Any, text: str) -> List[Tuple[str, str]]:
+        """분석기별 품사 태깅"""
+        if name == 'okt':
+            # Okt 사용 (가장 안정적)
+            return analyzer.pos(text, norm=True, stem=True)
+        # Mecab (더 정확) / Komoran
+        return analyzer.pos(text)
+    
+    def _is_key_pos(self, name: str, pos: str) -> bool:
+        """분석기별 주요 품사(명사, 동사, 형용사, 부사) 여부"""
+        if name == 'okt':
+            return pos in self._OKT_KEY_POS
+        if name == 'mecab':
+            return pos.startswith(self._MECAB_KEY_POS)
+        return pos in self._KOMORAN_KEY_POS
+    
+    def _split_for_analysis(self, text: str) -> List[str]:
+        """형태소 분석용으로 문장 경계에서 나눈 뒤 최대 길이 이하의 구간으로 묶음"""
+        if len(text) <= self._ANALYSIS_SEGMENT_SIZE:
+            return [text]
+        segments = []
+        current = ""
+        for sentence in self._SENTENCE_BOUNDARY_PATTERN.split(text):
+            if current and len(current) + len(sentence) + 1 > self._ANALYSIS_SEGMENT_SIZE:
+                segments.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}" if current else sentence
+        if current:
+            segments.append(current)
+        return segments
+    
     def split_excel_document(self, text: str, metadata: Dict[str, Any]) -> List[ExcelChunk]:
         """
         엑셀 문서를 청크로 분할 (행 단위 처리)
         
+        시트 머리말과 줄 구조가 남아 있는 추출 텍스트를 받아 행으로 나눈 뒤 시트의 행들을 preprocess_rows로
+        전처리합니다. (전체 텍스트를 먼저 전처리하면 줄 바꿈과 머리말이 사라져 문서 전체가 한 행이 됨)
+        
         Args:
-            text: 전처리된 텍스트
+            text: 추출된 텍스트 (extract_text_from_excel 결과)
             metadata: 문서 메타데이터
             
         Returns:
             엑셀 청크 리스트
         """
         chunks = []
+        file_name = metadata.get('file_name', 'unknown')
+        # 내용 해시 -> 등장 횟수 (같은 내용의 행이 여러 번 나오면 ID 뒤에 순번을 붙여 구분)
+        id_counts: Dict[str, int] = {}
         
         # 시트별로 분할
-        sheet_sections = text.split("=== 시트:")
-        
-        for section in sheet_sections:
-            if not section.strip():
-                continue
-            
-            # 시트 이름과 내용 분리
-            lines = section.strip().split('\n', 1)
-            if len(lines) < 2:
-                continue
-            
-            sheet_name = lines[0].replace(" ===", "").strip()
-            sheet_content = lines[1]
-            
+        for sheet_name, sheet_content in self._iter_sheet_sections(text):
             # 행별로 분할
-            rows = sheet_content.split('\n')
-            current_chunk = []
-            chunk_id = 0
-            
-            for row in rows:
+            raw_rows = []  # (행 정보, 원본 행 내용)
+            for row in sheet_content.splitlines():
                 if not row.strip():
                     continue
                 
@@ -318,32 +446,59 @@ class ExcelEmbeddingService:
                     row_info = "헤더"
                     row_content = row
                 
-                # 토큰 수 확인
-                row_tokens = self.tokenizer.encode(row_content)
-                
-                if len(row_tokens) <= self.chunk_size:
+                raw_rows.append((row_info, row_content))
+            
+            # 행 단위 전처리 (청크 ID가 행 내용을 따라가도록 행 경계를 유지, 형태소 분석은 시트 안에서 묶어 호출)
+            processed_rows = self.preprocess_rows([row_content for _, row_content in raw_rows])
+            rows = [
+                (row_info, row_content)
+                for (row_info, _), row_content in zip(raw_rows, processed_rows)
+                if row_content
+            ]
+            
+            # BPE 토큰은 최소 1바이트이므로 UTF-8 바이트 수가 chunk_size 이하인 행은 토큰화 없이 단일 청크로 확정
+            # (대부분의 짧은 행), 나머지 행만 한 번에 토큰화 (tiktoken이 GIL을 풀고 여러 스레드로 처리)
+            byte_lengths = [len(row_content.encode('utf-8')) for _, row_content in rows]
+            long_rows = [i for i, byte_length in enumerate(byte_lengths) if byte_length > self.chunk_size]
+            long_row_tokens = {}
+            if long_rows:
+                long_row_tokens = dict(zip(long_rows, self.tokenizer.encode_batch(
+                    [rows[i][1] for i in long_rows],
+                    num_threads=os.cpu_count() or 1
+                )))
+            chunk_id = 0
+            
+            for i, (row_info, row_content) in enumerate(rows):
+                row_tokens = long_row_tokens.get(i)
+                if row_tokens is None or len(row_tokens) <= self.chunk_size:
                     # 단일 행이 청크 크기보다 작은 경우
+                    if row_tokens is None:
+                        token_count = self._estimate_token_count(row_content, byte_lengths[i])
+                    else:
+                        token_count = len(row_tokens)
                     chunk = ExcelChunk(
                         content=row_content,
                         metadata=metadata.copy(),
-                        chunk_id=f"{metadata.get('file_name', 'unknown')}_{sheet_name}_chunk_{chunk_id}",
-                        token_count=len(row_tokens),
+                        chunk_id=self._make_chunk_id(file_name, row_content, id_counts),
+                        token_count=token_count,
                         sheet_name=sheet_name,
                         row_info=row_info
                     )
                     chunks.append(chunk)
                     chunk_id += 1
                 else:
-                    # 긴 행을 토큰 단위로 분할
-                    tokens = self.tokenizer.encode(row_content)
+                    # 긴 행을 토큰 단위로 분할 (이미 구한 토큰을 재사용하고 창들은 한 번에 디코딩)
+                    windows = []  # (시작, 끝)
                     start = 0
-                    
-                    while start < len(tokens):
+                    while start < len(row_tokens):
                         end = start + self.chunk_size
-                        chunk_tokens = tokens[start:end]
-                        
-                        chunk_text = self.tokenizer.decode(chunk_tokens)
-                        
+                        windows.append((start, end))
+                        start = end - self.chunk_overlap
+                    window_texts = self.tokenizer.decode_batch(
+                        [row_tokens[start:end] for start, end in windows]
+                    )
+                    
+                    for (start, end), chunk_text in zip(windows, window_texts):
                         chunk_metadata = metadata.copy()
                         chunk_metadata.update({
                             'sheet_name': sheet_name,
@@ -356,23 +511,78 @@ class ExcelEmbeddingService:
                         chunk = ExcelChunk(
                             content=chunk_text,
                             metadata=chunk_metadata,
-                            chunk_id=f"{metadata.get('file_name', 'unknown')}_{sheet_name}_chunk_{chunk_id}",
-                            token_count=len(chunk_tokens),
+                            chunk_id=self._make_chunk_id(file_name, chunk_text, id_counts),
+                            token_count=len(row_tokens[start:end]),
                             sheet_name=sheet_name,
                             row_info=row_info
                         )
                         chunks.append(chunk)
-                        
-                        start = end - self.chunk_overlap
                         chunk_id += 1
-                        
-                        if start >= len(tokens):
-                            break
         
         logger.info(f"엑셀 문서 분할 완료: {len(chunks)}개 청크 생성")
         return chunks
     
-    def create_embeddings(self, chunks: List[ExcelChunk]) -> List[List[float]]:
+    def _iter_sheet_sections(self, text: str) -> Iterator[Tuple[str, str]]:
+        """
+        추출 텍스트를 한 번만 훑어 (시트 이름, 시트 내용)을 순서대로 반환
+        
+        첫 시트 머리말 앞의 내용(머리말이 없는 CSV 텍스트 등)은 "main" 시트로 처리합니다.
+        """
+        position = 0
+        for match in self._SHEET_PATTERN.finditer(text):
+            if position == 0 and text[:match.start()].strip():
+                yield "main", text[:match.start()]
+            position = match.end()
+            yield match.group(1).strip(), match.group(2)
+        if position == 0 and text.strip():
+            yield "main", text
+    
+    @staticmethod
+    def _estimate_token_count(text: str, byte_length: int) -> int:
+        """
+        토큰화 없이 cl100k_base 토큰 수 추정 (짧은 행의 통계/정렬용)
+        
+        영문/숫자 등 ASCII는 약 4자당 1토큰, 한글 등 멀티바이트 문자(대부분 3바이트)는 약 1자당 1토큰으로 계산
+        """
+        multibyte_chars = (byte_length - len(text)) // 2
+        ascii_chars = len(text) - multibyte_chars
+        return max(1, ascii_chars // 4 + multibyte_chars)
+    
+    @staticmethod
+    def _make_chunk_id(file_name: str, content: str, id_counts: Dict[str, int]) -> str:
+        """
+        내용 기반 청크 ID 생성 (파일을 다시 처리해도 바뀌지 않은 행은 같은 ID)
+        
+        Args:
+            file_name: 파일명
+            content: 청크 내용
+            id_counts: 문서 안에서 해시별 등장 횟수 (호출 시 갱신)
+            
+        Returns:
+            청크 ID
+        """
+        digest = _content_hash(content)
+        occurrence = id_counts.get(digest, 0)
+        id_counts[digest] = occurrence + 1
+        if occurrence:
+            return f"{file_name}_{digest}_{occurrence}"
+        return f"{file_name}_{digest}"
+    
+    def _get_existing_chunk_ids(self, file_name: str) -> set:
+        """같은 파일명으로 이미 저장된 청크 ID 집합 조회"""
+        existing = self.collection.get(where={'file_name': file_name}, include=[])
+        return set(existing['ids'])
+    
+    def _refresh_chunk_metadata(self, chunks: List[ExcelChunk]):
+        """재사용한 청크의 메타데이터(처리 시각, 행 정보 등)를 이번 처리 결과로 갱신 (임베딩은 그대로)"""
+        for start in range(0, len(chunks), self._STORE_BATCH_SIZE):
+            batch = chunks[start:start + self._STORE_BATCH_SIZE]
+            self.collection.update(
+                ids=[chunk.chunk_id for chunk in batch],
+                metadatas=[chunk.metadata for chunk in batch]
+            )
+    
+    def create_embeddings(self, chunks: List[ExcelChunk]) -> np.ndarray:
         """
         엑셀 청크들의 임베딩 생성
         
@@ -380,29 +590,80 @@ class ExcelEmbeddingService:
             chunks: 엑셀 청크 리스트
             
         Returns:
-            임베딩 벡터 리스트
+            임베딩 행렬 (청크 수 x 차원, float32)
         """
         try:
-            # 청크 텍스트 추출
-            texts = [chunk.content for chunk in chunks]
-            
-            # 임베딩 생성
-            embeddings = self.embedding_model.encode(texts, show_progress_bar=True)
+            dimension = self.embedding_model.get_sentence_embedding_dimension()
+            
+            # 같은 내용의 청크(상태값, 분류명 등 반복 셀)는 한 번만 임베딩
+            unique_index: Dict[str, int] = {}
+            unique_token_counts: List[int] = []
+            inverse = np.empty(len(chunks), dtype=np.intp)
+            for i, chunk in enumerate(chunks):
+                index = unique_index.get(chunk.content)
+                if index is None:
+                    index = unique_index[chunk.content] = len(unique_token_counts)
+                    unique_token_counts.append(chunk.token_count)
+                inverse[i] = index
+            unique_texts = list(unique_index)
+            unique_embeddings = np.empty((len(unique_texts), dimension), dtype=np.float32)
+            
+            # 이전 문서에서 이미 임베딩한 텍스트는 캐시에서 재사용
+            keys = [hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest() for text in unique_texts]
+            missing = []
+            with self._embed_cache_lock:
+                for i, key in enumerate(keys):
+                    cached = self._embed_cache.get(key)
+                    if cached is None:
+                        missing.append(i)
+                    else:
+                        self._embed_cache.move_to_end(key)
+                        unique_embeddings[i] = cached
+            
+            if missing:
+                # 토큰 수 순으로 정렬해 비슷한 길이의 청크끼리 배치로 묶음 (패딩 토큰 계산 최소화)
+                order = sorted(missing, key=unique_token_counts.__getitem__)
+                
+                # 임베딩 생성
+                embeddings_sorted = self.embedding_model.encode(
+                    [unique_texts[i] for i in order],
+                    batch_size=self.encode_batch_size,
+                    show_progress_bar=True,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True
+                )
+                
+                # 원래 순서 위치에 기록
+                unique_embeddings[order] = embeddings_sorted
+                with self._embed_cache_lock:
+                    for i in order:
+                        self._embed_cache[keys[i]] = unique_embeddings[i].copy()
+                    while len(self._embed_cache) > self._EMBED_CACHE_SIZE:
+                        self._embed_cache.popitem(last=False)
+            
+            # 중복 청크에 결과를 펼쳐 원래 청크 순서로 복원
+            embeddings = unique_embeddings[inverse]
+            if chunks:
+                logger.info(
+                    f"엑셀 임베딩 중복 제거: 청크 {len(chunks)}개 중 고유 {len(unique_texts)}개, "
+                    f"새로 계산 {len(missing)}개"
+                )
             
             logger.info(f"엑셀 임베딩 생성 완료: {len(embeddings)}개 벡터")
-            return embeddings.tolist()
+            # tolist()로 Python float 리스트를 만들지 않고 NumPy 배열 그대로 Chroma에 전달
+            return embeddings
             
         except Exception as e:
             logger.error(f"엑셀 임베딩 생성 실패: {e}")
             raise
     
-    def store_embeddings(self, chunks: List[ExcelChunk], embeddings: List[List[float]]):
+    def store_embeddings(self, chunks: List[ExcelChunk], embeddings: np.ndarray):
         """
         임베딩을 벡터 DB에 저장
         
         Args:
             chunks: 엑셀 청크 리스트
-            embeddings: 임베딩 벡터 리스트
+            embeddings: 임베딩 행렬 (create_embeddings 결과)
         """
         try:
             # 벡터 DB에 저장할 데이터 준비
@@ -410,13 +671,16 @@ class ExcelEmbeddingService:
             documents = [chunk.content for chunk in chunks]
             metadatas = [chunk.metadata for chunk in chunks]
             
-            # 벡터 DB에 추가
-            self.collection.add(
-                embeddings=embeddings,
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids
-            )
+            # 벡터 DB에 배치 단위로 추가 (Chroma의 요청당 최대 크기를 넘지 않도록)
+            batch_size = self._STORE_BATCH_SIZE
+            for start in range(0, len(ids), batch_size):
+                end = start + batch_size
+                self.collection.add(
+                    embeddings=embeddings[start:end],
+                    documents=documents[start:end],
+                    metadatas=metadatas[start:end],
+                    ids=ids[start:end]
+                )
             
             logger.info(f"엑셀 벡터 DB 저장 완료: {len(chunks)}개 청크")
             
@@ -456,32 +720,49 @@ class ExcelEmbeddingService:
             raw_text = self.extract_text_from_excel(file_path)
             logger.info(f"텍스트 추출 완료: {len(raw_text)} 문자")
             
-            # 2. 전처리
-            logger.info("2단계: 텍스트 전처리")
-            processed_text = self.preprocess_text(raw_text)
-            logger.info(f"전처리 완료: {len(processed_text)} 문자")
-            
-            # 3. 문서 분할
-            logger.info("3단계: 문서 분할")
-            chunks = self.split_excel_document(processed_text, metadata)
+            # 2~3. 문서 분할 및 행 단위 전처리
+            logger.info("2단계: 텍스트 전처리 / 3단계: 문서 분할")
+            chunks = self.split_excel_document(raw_text, metadata)
+            del raw_text  # 단계가 끝난 중간 결과는 바로 해제 (최대 메모리 = 단계별 합이 아닌 가장 큰 단계)
             logger.info(f"문서 분할 완료: {len(chunks)}개 청크")
             
+            # 이미 저장된 청크는 임베딩을 건너뛰고, 새 버전에서 사라진 청크는 저장 후 삭제
+            # (ID 조회 한 번: 임베딩 없이 ID만 가져옴)
+            existing_ids = self._get_existing_chunk_ids(file_name)
+            new_chunks = [chunk for chunk in chunks if chunk.chunk_id not in existing_ids]
+            reused_chunks = [chunk for chunk in chunks if chunk.chunk_id in existing_ids]
+            stale_ids = existing_ids.difference(chunk.chunk_id for chunk in chunks)
+            skipped_chunks = len(chunks) - len(new_chunks)
+            total_chunks = len(chunks)
+            total_tokens = sum(chunk.token_count for chunk in chunks)
+            del chunks, existing_ids
+            logger.info(
+                f"기존 청크 재사용: {skipped_chunks}개, 새 청크: {len(new_chunks)}개, "
+                f"삭제된 청크: {len(stale_ids)}개"
+            )
+            
             # 4. 임베딩 생성
             logger.info("4단계: 임베딩 생성")
-            embeddings = self.create_embeddings(chunks)
+            embeddings = self.create_embeddings(new_chunks)
             logger.info(f"임베딩 생성 완료: {len(embeddings)}개 벡터")
             
             # 5. 벡터 DB 저장
             logger.info("5단계: 벡터 DB 저장")
-            self.store_embeddings(chunks, embeddings)
+            self.store_embeddings(new_chunks, embeddings)
+            self._refresh_chunk_metadata(reused_chunks)
+            if stale_ids:
+                self.collection.delete(ids=list(stale_ids))
+            embedding_dimension = embeddings.shape[1]
+            del new_chunks, reused_chunks, embeddings
             logger.info("벡터 DB 저장 완료")
             
             # 결과 반환
             result = {
                 'file_name': file_name,
-                'total_chunks': len(chunks),
-                'total_tokens': sum(chunk.token_count for chunk in chunks),
-                'embedding_dimension': len(embeddings[0]) if embeddings else 0,
+                'total_chunks': total_chunks,
+                'skipped_chunks': skipped_chunks,
+                'total_tokens': total_tokens,
+                'embedding_dimension': embedding_dimension,
                 'processing_success': True,
                 'metadata': metadata
             }
@@ -510,7 +791,7 @@ class ExcelEmbeddingService:
         """
         try:
             # 쿼리 임베딩 생성
-            query_embedding = self.embedding_model.encode([query])
+            query_embedding = self.embedding_model.encode([query], normalize_embeddings=True)
             
             # 벡터 DB에서 유사한 청크 검색
             results = self.collection.query(
@@ -4,13 +4,33 @@
 RAG 시스템에서 엑셀 문서의 텍스트를 추출하는 기본 기능
 """
 
+import io
 import logging
 import pandas as pd
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Tuple, Iterator
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Rust 기반 엑셀 파서 (선택적, pandas 2.2 이상에서 engine="calamine"으로 사용 가능)
+try:
+    import python_calamine  # noqa: F401
+    CALAMINE_AVAILABLE = "calamine" in pd.ExcelFile._engines
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+# pyarrow 기반 DataFrame (선택적): 문자열 열을 Python 객체 대신 연속된 Arrow 버퍼에 저장해 메모리 절약
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# read_csv / read_excel 공통 읽기 옵션
+_READ_OPTIONS: Dict[str, Any] = {"na_filter": True}
+if PYARROW_AVAILABLE:
+    _READ_OPTIONS["dtype_backend"] = "pyarrow"
+
 class ExcelProcessor:
     """엑셀 문서 텍스트 추출 클래스"""
     
@@ -28,46 +48,49 @@ class ExcelProcessor:
             str: 추출된 텍스트
         """
         try:
-            file_extension = Path(file_path).suffix.lower()
-            
-            if file_extension not in self.supported_formats:
-                raise ValueError(f"지원하지 않는 엑셀 파일 형식: {file_extension}")
-            
-            logger.info(f"엑셀 파일 텍스트 추출 시작: {file_path}")
-            
-            if file_extension == '.csv':
-                # CSV 파일 처리
-                df = pd.read_csv(file_path, na_filter=True)
-            else:
-                # Excel 파일 처리 (모든 시트 포함)
-                excel_file = pd.ExcelFile(file_path)
-                all_sheets = []
-                
-                for sheet_name in excel_file.sheet_names:
-                    df = pd.read_excel(file_path, sheet_name=sheet_name, na_filter=True)
-                    all_sheets.append((sheet_name, df))
-                
-                # 모든 시트의 데이터를 하나의 텍스트로 결합
-                text_parts = []
-                for sheet_name, df in all_sheets:
-                    sheet_text = self._process_dataframe(df, sheet_name)
-                    if sheet_text:
-                        text_parts.append(f"=== 시트: {sheet_name} ===\n{sheet_text}")
-                
-                extracted_text = "\n\n".join(text_parts)
-                logger.info(f"텍스트 추출 완료: {len(extracted_text)} 문자")
-                return extracted_text
-            
-            # 단일 시트 처리 (CSV 또는 단일 시트 Excel)
-            extracted_text = self._process_dataframe(df, "main")
+            # 모든 시트의 데이터를 하나의 텍스트로 결합
+            extracted_text = "\n\n".join(self.iter_excel_sections(file_path))
             logger.info(f"텍스트 추출 완료: {len(extracted_text)} 문자")
-            
             return extracted_text
                 
         except Exception as e:
             logger.error(f"엑셀 파일 텍스트 추출 실패: {file_path}, 오류: {e}")
             raise
     
+    def iter_excel_sections(self, file_path: str) -> Iterator[str]:
+        """
+        엑셀 문서를 시트 단위 텍스트로 하나씩 반환 (한 번에 한 시트만 메모리에 유지)
+        
+        Args:
+            file_path: 엑셀 파일 경로
+            
+        Yields:
+            str: 시트 텍스트 (CSV는 머리말 없는 단일 텍스트)
+        """
+        file_extension = Path(file_path).suffix.lower()
+        
+        if file_extension not in self.supported_formats:
+            raise ValueError(f"지원하지 않는 엑셀 파일 형식: {file_extension}")
+        
+        logger.info(f"엑셀 파일 텍스트 추출 시작: {file_path}")
+        
+        if file_extension == '.csv':
+            # CSV 파일 처리 (단일 시트)
+            df = pd.read_csv(file_path, **_READ_OPTIONS)
+            extracted_text = self._process_dataframe(df, "main")
+            if extracted_text:
+                yield extracted_text
+            return
+        
+        # Excel 파일 처리 (모든 시트 포함)
+        # 통합 문서를 한 번만 열고 파싱된 파일에서 시트를 하나씩 읽음 (시트마다 ZIP/XML을 다시 열지 않음)
+        with pd.ExcelFile(file_path, engine="calamine" if CALAMINE_AVAILABLE else None) as excel_file:
+            for sheet_name in excel_file.sheet_names:
+                df = excel_file.parse(sheet_name=sheet_name, **_READ_OPTIONS)
+                sheet_text = self._process_dataframe(df, sheet_name)
+                if sheet_text:
+                    yield f"=== 시트: {sheet_name} ===\n{sheet_text}"
+    
     def _process_dataframe(self, df: pd.DataFrame, sheet_name: str) -> str:
         """
         DataFrame을 텍스트로 변환
@@ -82,37 +105,33 @@ class ExcelProcessor:
         if df.empty:
             return ""
         
-        text_parts = []
+        # 줄 목록을 모았다가 join하지 않고 버퍼에 바로 기록 (큰 시트에서 최대 메모리 사용량 절반)
+        buffer = io.StringIO()
         
         # 열 헤더 추가
         headers = [str(col) for col in df.columns if str(col) != 'nan']
         if headers:
-            text_parts.append(f"열: {' | '.join(headers)}")
+            buffer.write(f"열: {' | '.join(headers)}\n")
         
         # 각 행을 텍스트로 변환
-        for idx, row in df.iterrows():
-            row_text = []
-            for col in df.columns:
-                value = row[col]
-                
-                # NaN 값 제외
-                if pd.isna(value):
-                    continue
-                
-                # 수식이나 계산된 값 처리
-                if isinstance(value, (int, float)):
-                    # 숫자 값은 문자열로 변환
-                    row_text.append(str(value))
-                else:
-                    # 문자열 값
-                    str_value = str(value).strip()
-                    if str_value and str_value != 'nan':
-                        row_text.append(str_value)
-            
+        # iterrows는 행마다 Series를 만들어 느리므로 NumPy 배열로 한 번에 변환
+        # (to_numpy는 iterrows와 같은 공통 dtype 변환을 거치므로 값 표현이 동일,
+        #  pyarrow 열은 Python 스칼라와 pd.NA로 변환되고 pd.isna가 둘 다 처리)
+        values = df.to_numpy()
+        present = ~pd.isna(values)  # NaN 값 제외
+        for idx, row, row_present in zip(df.index, values, present):
+            if not row_present.any():
+                continue
+            row_text = [
+                str_value
+                for str_value in (str(value).strip() for value in row[row_present])
+                if str_value and str_value != 'nan'
+            ]
             if row_text:
-                text_parts.append(f"행{idx+1}: {' | '.join(row_text)}")
+                buffer.write(f"행{idx+1}: {' | '.join(row_text)}\n")
         
-        return "\n".join(text_parts)
+        # 마지막 줄바꿈 제외
+        return buffer.getvalue()[:-1]
 
 # 전역 인스턴스
 excel_processor = ExcelProcessor() 
\ No newline at end of file
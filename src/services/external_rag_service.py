@@ -3,22 +3,60 @@
 Chroma API를 사용한 외부 RAG 서버와의 통신을 담당합니다.
 """
 
+import hashlib
 import httpx
 import logging
 import json
 import asyncio
-import random
-import math
-from typing import Dict, List, Optional, Any, Tuple
+import numpy as np
+from typing import Dict, List, Optional, Any, Tuple, Union
 from datetime import datetime, timedelta
 from pathlib import Path
+import os
 import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+# orjson이 설치되어 있으면 NumPy 배열을 그대로 직렬화 (float32 임베딩을 Python float 리스트로 바꾸지 않음)
+# (통계 파일/JSONL 직렬화에도 사용)
+try:
+    import orjson
+
+    def _dumps_payload(payload: Dict[str, Any]) -> bytes:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    def _dumps_stats(stats: Dict[str, Any]) -> bytes:
+        return orjson.dumps(stats, option=orjson.OPT_INDENT_2)
+
+    def _dumps_line(record: Dict[str, Any]) -> bytes:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    def _dumps_payload(payload: Dict[str, Any]) -> bytes:
+        return json.dumps(payload, default=lambda value: value.tolist()).encode("utf-8")
+
+    def _dumps_stats(stats: Dict[str, Any]) -> bytes:
+        return json.dumps(stats, ensure_ascii=False, indent=2).encode("utf-8")
+
+    def _dumps_line(record: Dict[str, Any]) -> bytes:
+        return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+# HTTP/2 (선택적, h2 패키지 필요): 쿼리와 헬스 체크를 하나의 연결에서 다중화
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 class ExternalRAGService:
     """외부 RAG 서비스 클래스"""
     
+    # 통계 파일에 유지할 최근 쿼리 수
+    _RECENT_QUERIES_LIMIT = 100
+    # 통계 스냅숏 최소 간격(초)
+    _STATS_SNAPSHOT_INTERVAL = 30.0
+    
     def __init__(self, settings):
         self.settings = settings
         self.enabled = settings.external_rag_enabled
@@ -34,6 +72,15 @@ class ExternalRAGService:
         # 통계 관련 설정
         self.stats_enabled = settings.external_rag_stats_enabled
         self.stats_file = Path(settings.external_rag_stats_file)
+        # 쿼리마다 통계 파일 전체를 다시 쓰지 않고 최근 쿼리는 JSONL에 한 줄씩 추가,
+        # 전체 통계는 주기적으로 스냅숏 (스냅숏 후 JSONL은 비움)
+        self._recent_queries_log = self.stats_file.with_suffix(".jsonl")
+        self._recent_queries: deque = deque(maxlen=self._RECENT_QUERIES_LIMIT)
+        self._stats_created_at = datetime.now().isoformat()
+        self._last_stats_snapshot = time.monotonic()
+        self._stats_dirty = False
+        # 추가/스냅숏 순서가 뒤바뀌지 않도록 통계 파일 I/O는 단일 스레드에서 순서대로 실행
+        self._stats_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="external-rag-stats")
         
         # 쿼리 엔드포인트 구성
         self.query_endpoint = f"{self.base_url}/api/v2/tenants/{self.tenant_id}/databases/{self.db_name}/collections/{self.collection_id}/query"
@@ -41,14 +88,37 @@ class ExternalRAGService:
         # 임베딩 모델 초기화 (384차원 모델 사용)
         self.embedding_model = None
         try:
-            from sentence_transformers import SentenceTransformer
-            self.embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
+            from src.utils.embedding_models import get_sentence_transformer
+            # embedding_backend="onnx"면 ONNX Runtime으로 CPU 추론 (실패 시 torch 모델)
+            self.embedding_model = get_sentence_transformer(
+                "all-MiniLM-L6-v2",
+                onnx=settings.embedding_backend.lower() == "onnx"
+            )
             logger.info("SentenceTransformer 모델 로드 성공")
         except ImportError:
             logger.warning("SentenceTransformer가 설치되지 않았습니다. 더미 임베딩을 사용합니다.")
         except Exception as e:
             logger.warning(f"SentenceTransformer 모델 로드 실패: {e}. 더미 임베딩을 사용합니다.")
         
+        # 동시에 들어온 쿼리 임베딩을 짧은 시간 창 동안 모아 encode 한 번으로 처리 (첫 사용 시 작업 시작)
+        self._encode_max_batch = settings.search_batch_max_size
+        self._encode_max_wait = settings.search_batch_wait_ms / 1000.0
+        self._encode_queue: Optional[asyncio.Queue] = None
+        self._encode_task: Optional[asyncio.Task] = None
+        
+        # 최근 쿼리 임베딩 LRU 캐시 (이벤트 루프 스레드에서만 접근)
+        self._query_embedding_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._query_embedding_cache_size = settings.query_embedding_cache_size
+        
+        # Chroma API v2 형식에 맞는 헬스 체크 페이로드 (매번 같으므로 한 번만 직렬화)
+        self._health_payload_body = _dumps_payload({
+            "query_embeddings": [self._text_to_embedding("")],
+            "n_results": 1
+        })
+        
+        # 쿼리/헬스 체크가 공유하는 HTTP 클라이언트 (이벤트 루프 안에서 처음 사용할 때 생성)
+        self._client: Optional[httpx.AsyncClient] = None
+        
         # 상태 변수들
         self.last_health_check = None
         self.health_status = "unknown"
@@ -92,53 +162,141 @@ class ExternalRAGService:
             # 오류 시 더미 임베딩 반환
             return self._generate_dummy_embedding(text, 384)
     
+    def _get_client(self) -> httpx.AsyncClient:
+        """공유 HTTP 클라이언트 반환 (요청마다 TCP/TLS 연결을 새로 맺지 않고 keep-alive 연결 재사용)"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_keepalive_connections=32)
+            )
+        return self._client
+    
+    async def aclose(self):
+        """저장되지 않은 통계를 스냅숏으로 남기고 공유 HTTP 클라이언트를 닫습니다."""
+        if self.stats_enabled and self._stats_dirty:
+            try:
+                await self._write_stats_snapshot()
+            except Exception as e:
+                logger.error(f"외부 RAG 통계 저장 실패: {e}")
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def _embed_async(self, text: str) -> Union[np.ndarray, List[float]]:
+        """
+        쿼리 텍스트를 임베딩으로 변환합니다. (최근 쿼리는 캐시, 동시 요청은 마이크로 배치로 묶어 인코딩)
+        
+        Args:
+            text: 변환할 텍스트
+            
+        Returns:
+            임베딩 벡터 (모델 결과는 float32 배열, 더미 임베딩은 리스트)
+        """
+        if self.embedding_model is None or not text or text.strip() == "":
+            return self._text_to_embedding(text)
+        
+        # all-MiniLM-L6-v2는 소문자로 토큰화하므로 앞뒤 공백/대소문자만 다른 쿼리는 같은 임베딩
+        key = text.strip().lower()
+        cached = self._query_embedding_cache.get(key)
+        if cached is not None:
+            self._query_embedding_cache.move_to_end(key)
+            return cached
+        
+        try:
+            if self._encode_max_wait <= 0:
+                embedding = (await asyncio.to_thread(self._encode_texts, [key]))[0]
+            else:
+                if self._encode_task is None or self._encode_task.done():
+                    self._encode_queue = asyncio.Queue()
+                    self._encode_task = asyncio.create_task(self._encode_loop(self._encode_queue))
+                future = asyncio.get_running_loop().create_future()
+                await self._encode_queue.put((key, future))
+                embedding = await future
+        except Exception as e:
+            logger.error(f"텍스트 임베딩 변환 실패: {e}")
+            # 오류 시 더미 임베딩 반환 (캐시하지 않음)
+            return self._generate_dummy_embedding(text, 384)
+        
+        self._query_embedding_cache[key] = embedding
+        if len(self._query_embedding_cache) > self._query_embedding_cache_size:
+            self._query_embedding_cache.popitem(last=False)
+        return embedding
+    
+    def _encode_texts(self, texts: List[str]) -> List[np.ndarray]:
+        """여러 텍스트를 한 번에 인코딩 (encode는 내부에서 길이순 정렬 후 배치 처리)"""
+        embeddings = self.embedding_model.encode(
+            texts,
+            batch_size=self._encode_max_batch,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+        return list(embeddings.astype(np.float32, copy=False))
+    
+    async def _encode_loop(self, queue: asyncio.Queue):
+        """대기 중인 쿼리를 최대 max_wait 동안(또는 max_batch가 찰 때까지) 모아 한 번에 인코딩"""
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await queue.get()]
+            deadline = loop.time() + self._encode_max_wait
+            while len(pending) < self._encode_max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    pending.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                # 이벤트 루프를 막지 않도록 스레드에서 실행
+                vectors = await asyncio.to_thread(self._encode_texts, [text for text, _ in pending])
+            except Exception as e:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (_, future), vector in zip(pending, vectors):
+                if not future.done():
+                    future.set_result(vector)
+    
     def _generate_dummy_embedding(self, text: str, dimension: int = 384) -> List[float]:
         """간단한 더미 임베딩 벡터 생성 (테스트용)"""
-        # 텍스트의 해시값을 기반으로 일관된 임베딩 생성
-        import hashlib
-        hash_obj = hashlib.md5(text.encode())
-        hash_hex = hash_obj.hexdigest()
-        
-        # 해시값을 기반으로 시드 설정
-        random.seed(int(hash_hex[:8], 16))
-        
-        # 정규 분포를 시뮬레이션하여 임베딩 벡터 생성
-        embedding = []
-        for _ in range(dimension):
-            # Box-Muller 변환을 사용하여 정규 분포 생성
-            u1 = random.random()
-            u2 = random.random()
-            z = math.sqrt(-2 * math.log(u1)) * math.cos(2 * math.pi * u2)
-            embedding.append(z)
+        # 텍스트의 해시값을 기반으로 일관된 임베딩 생성 (시드용이라 충돌 저항성 불필요, md5보다 빠른 blake2b)
+        seed = int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+        
+        # 해시값을 시드로 정규 분포 벡터를 한 번에 생성 (NumPy 벡터 연산)
+        rng = np.random.default_rng(seed)
+        embedding = rng.standard_normal(dimension).astype(np.float32)
         
         # 정규화
-        norm = math.sqrt(sum(x * x for x in embedding))
+        norm = np.linalg.norm(embedding)
         if norm > 0:
-            embedding = [x / norm for x in embedding]
+            embedding /= norm
         
-        return embedding
+        return embedding.tolist()
     
     def _initialize_stats(self):
-        """통계 파일 초기화"""
+        """통계 파일 초기화 (이전 스냅숏과 그 이후 JSONL에 추가된 최근 쿼리를 불러옴)"""
         if not self.stats_enabled:
             return
             
         try:
-            if not self.stats_file.exists():
-                initial_stats = {
-                    "total_queries": 0,
-                    "successful_queries": 0,
-                    "failed_queries": 0,
-                    "average_response_time": 0.0,
-                    "last_health_check": None,
-                    "health_status": "unknown",
-                    "created_at": datetime.now().isoformat(),
-                    "updated_at": datetime.now().isoformat()
-                }
+            if self.stats_file.exists():
+                with open(self.stats_file, 'r', encoding='utf-8') as f:
+                    stats = json.load(f)
+                self._stats_created_at = stats.get("created_at", self._stats_created_at)
+                self._recent_queries.extend(stats.get("recent_queries", []))
                 
+                if self._recent_queries_log.exists():
+                    with open(self._recent_queries_log, 'r', encoding='utf-8') as f:
+                        for line in f:
+                            if line.strip():
+                                self._recent_queries.append(json.loads(line))
+            else:
                 self.stats_file.parent.mkdir(parents=True, exist_ok=True)
-                with open(self.stats_file, 'w', encoding='utf-8') as f:
-                    json.dump(initial_stats, f, ensure_ascii=False, indent=2)
+                self._write_stats_sync(self._build_stats())
                     
                 logger.info(f"외부 RAG 통계 파일 초기화: {self.stats_file}")
         except Exception as e:
@@ -171,48 +329,41 @@ class ExternalRAGService:
         start_time = time.time()
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                # Chroma API v2 형식에 맞는 헬스 체크 페이로드
-                health_payload = {
-                    "query_embeddings": [self._text_to_embedding("")],
-                    "n_results": 1
+            client = self._get_client()
+            response = await client.post(
+                self.query_endpoint,
+                content=self._health_payload_body,
+                headers={"Content-Type": "application/json"}
+            )
+            
+            response_time = time.time() - start_time
+            self.last_health_check = datetime.now()
+            
+            if response.status_code == 200:
+                self.health_status = "healthy"
+                
+                result = {
+                    "status": "healthy",
+                    "response_time": response_time,
+                    "timestamp": self.last_health_check.isoformat(),
+                    "endpoint": self.query_endpoint
                 }
                 
-                response = await client.post(
-                    self.query_endpoint,
-                    json=health_payload,
-                    headers={"Content-Type": "application/json"}
-                )
+                logger.info(f"외부 RAG 헬스 체크 성공: {response_time:.3f}초")
+                return result
+            else:
+                self.health_status = "error"
+                result = {
+                    "status": "error",
+                    "response_time": response_time,
+                    "timestamp": self.last_health_check.isoformat(),
+                    "endpoint": self.query_endpoint,
+                    "error_message": f"HTTP {response.status_code}: {response.text}"
+                }
                 
-                response_time = time.time() - start_time
-                self.last_health_check = datetime.now()
+                logger.warning(f"외부 RAG 헬스 체크 실패: HTTP {response.status_code}")
+                return result
                 
-                if response.status_code == 200:
-                    self.health_status = "healthy"
-                    self.response_time_avg = response_time
-                    
-                    result = {
-                        "status": "healthy",
-                        "response_time": response_time,
-                        "timestamp": self.last_health_check.isoformat(),
-                        "endpoint": self.query_endpoint
-                    }
-                    
-                    logger.info(f"외부 RAG 헬스 체크 성공: {response_time:.3f}초")
-                    return result
-                else:
-                    self.health_status = "error"
-                    result = {
-                        "status": "error",
-                        "response_time": response_time,
-                        "timestamp": self.last_health_check.isoformat(),
-                        "endpoint": self.query_endpoint,
-                        "error_message": f"HTTP {response.status_code}: {response.text}"
-                    }
-                    
-                    logger.warning(f"외부 RAG 헬스 체크 실패: HTTP {response.status_code}")
-                    return result
-                    
         except Exception as e:
             response_time = time.time() - start_time
             self.health_status = "unreachable"
@@ -255,77 +406,79 @@ class ExternalRAGService:
         try:
             # Chroma API v2 형식에 맞는 쿼리 페이로드 구성
             payload = {
-                "query_embeddings": [self._text_to_embedding(query)],
+                "query_embeddings": [await self._embed_async(query)],
                 "n_results": n_results,
                 "include": ["metadatas", "documents"]
             }
+            body = _dumps_payload(payload)  # 재시도 시 다시 직렬화하지 않음
             
             # 재시도 로직
             for attempt in range(self.max_retries):
                 try:
-                    async with httpx.AsyncClient(timeout=self.timeout) as client:
-                        response = await client.post(
-                            self.query_endpoint,
-                            json=payload,
-                            headers={"Content-Type": "application/json"}
-                        )
+                    client = self._get_client()
+                    response = await client.post(
+                        self.query_endpoint,
+                        content=body,
+                        headers={"Content-Type": "application/json"}
+                    )
+                    
+                    response_time = time.time() - start_time
+                    
+                    if response.status_code == 200:
+                        response_data = response.json()
+                        processed_results = self._process_response(response_data)
                         
-                        response_time = time.time() - start_time
+                        # 성공 통계 업데이트
+                        self.success_count += 1
+                        # 성공한 쿼리 응답 시간의 누적 평균 (증분 평균)
+                        self.response_time_avg += (response_time - self.response_time_avg) / self.success_count
                         
-                        if response.status_code == 200:
-                            response_data = response.json()
-                            processed_results = self._process_response(response_data)
-                            
-                            # 성공 통계 업데이트
-                            self.success_count += 1
-                            self.response_time_avg = (self.response_time_avg + response_time) / 2
+                        result = {
+                            "success": True,
+                            "query": query,
+                            "results": processed_results["results"],
+                            "total_results": processed_results["total_results"],
+                            "response_time": response_time,
+                            "attempt": attempt + 1
+                        }
+                        
+                        # 통계 저장
+                        await self._update_stats(result)
+                        
+                        logger.info(f"외부 RAG 쿼리 성공: {response_time:.3f}초, {len(processed_results['results'])}개 결과")
+                        return result
+                    else:
+                        error_msg = f"외부 RAG 서버 오류: HTTP {response.status_code}"
+                        try:
+                            error_detail = response.json()
+                            error_msg += f" - {error_detail}"
+                        except:
+                            error_msg += f" - {response.text}"
+                        
+                        logger.warning(f"외부 RAG 쿼리 실패 (시도 {attempt + 1}/{self.max_retries}): {error_msg}")
+                        
+                        if attempt == self.max_retries - 1:
+                            # 마지막 시도 실패
+                            self.failure_count += 1
+                            await self._update_stats({
+                                "success": False,
+                                "query": query,
+                                "error_message": error_msg,
+                                "response_time": response_time
+                            })
                             
-                            result = {
-                                "success": True,
+                            return {
+                                "success": False,
                                 "query": query,
-                                "results": processed_results["results"],
-                                "total_results": processed_results["total_results"],
-                                "response_time": response_time,
-                                "attempt": attempt + 1
+                                "message": error_msg,
+                                "results": [],
+                                "total_results": 0,
+                                "response_time": response_time
                             }
-                            
-                            # 통계 저장
-                            await self._update_stats(result)
-                            
-                            logger.info(f"외부 RAG 쿼리 성공: {response_time:.3f}초, {len(processed_results['results'])}개 결과")
-                            return result
-                        else:
-                            error_msg = f"외부 RAG 서버 오류: HTTP {response.status_code}"
-                            try:
-                                error_detail = response.json()
-                                error_msg += f" - {error_detail}"
-                            except:
-                                error_msg += f" - {response.text}"
-                            
-                            logger.warning(f"외부 RAG 쿼리 실패 (시도 {attempt + 1}/{self.max_retries}): {error_msg}")
-                            
-                            if attempt == self.max_retries - 1:
-                                # 마지막 시도 실패
-                                self.failure_count += 1
-                                await self._update_stats({
-                                    "success": False,
-                                    "query": query,
-                                    "error_message": error_msg,
-                                    "response_time": response_time
-                                })
-                                
-                                return {
-                                    "success": False,
-                                    "query": query,
-                                    "message": error_msg,
-                                    "results": [],
-                                    "total_results": 0,
-                                    "response_time": response_time
-                                }
-                            
-                            # 재시도 전 잠시 대기
-                            await asyncio.sleep(1)
-                            
+                        
+                        # 재시도 전 잠시 대기
+                        await asyncio.sleep(1)
+                        
                 except httpx.TimeoutException:
                     logger.warning(f"외부 RAG 쿼리 타임아웃 (시도 {attempt + 1}/{self.max_retries})")
                     if attempt == self.max_retries - 1:
@@ -379,37 +532,38 @@ class ExternalRAGService:
         # response_data 자체가 results 데이터이거나 response_data["results"]에 있을 수 있음
         results_data = response_data.get("results", response_data)
         
-        total_results = 0
+        # 쿼리가 하나이므로 각 필드의 첫 번째 행만 사용 (반복문 밖에서 한 번만 꺼냄)
+        ids = self._first_row(results_data, "ids")
+        distances = self._first_row(results_data, "distances")
+        metadatas = self._first_row(results_data, "metadatas")
+        documents = self._first_row(results_data, "documents")
+        num_distances, num_metadatas, num_documents = len(distances), len(metadatas), len(documents)
         
         # 결과 수 계산 - ids 배열의 첫 번째 요소 길이
-        if "ids" in results_data and results_data["ids"] and len(results_data["ids"]) > 0:
-            total_results = len(results_data["ids"][0])
+        total_results = len(ids)
         
         logger.info(f"외부 RAG 응답 처리: total_results={total_results}")
         
-        for i in range(total_results):
+        for i, result_id in enumerate(ids):
             result_item = {
-                "rank": i + 1
+                "rank": i + 1,
+                "id": result_id
             }
             
-            # ID
-            if "ids" in results_data and results_data["ids"] and len(results_data["ids"]) > 0 and len(results_data["ids"][0]) > i:
-                result_item["id"] = results_data["ids"][0][i]
-            
             # 거리 (유사도)
-            if "distances" in results_data and results_data["distances"] and len(results_data["distances"]) > 0 and len(results_data["distances"][0]) > i:
-                distance = results_data["distances"][0][i]
+            if i < num_distances:
+                distance = distances[i]
                 result_item["distance"] = distance
                 if distance is not None:
                     result_item["similarity"] = 1 - distance
             
             # 메타데이터
-            if "metadatas" in results_data and results_data["metadatas"] and len(results_data["metadatas"]) > 0 and len(results_data["metadatas"][0]) > i:
-                result_item["metadata"] = results_data["metadatas"][0][i]
+            if i < num_metadatas:
+                result_item["metadata"] = metadatas[i]
             
             # 문서 내용
-            if "documents" in results_data and results_data["documents"] and len(results_data["documents"]) > 0 and len(results_data["documents"][0]) > i:
-                result_item["document"] = results_data["documents"][0][i]
+            if i < num_documents:
+                result_item["document"] = documents[i]
             
             results.append(result_item)
         
@@ -420,39 +574,20 @@ class ExternalRAGService:
             "total_results": len(results)
         }
     
+    @staticmethod
+    def _first_row(results_data: Dict, key: str) -> List[Any]:
+        """Chroma 쿼리 응답 필드(쿼리별 리스트의 리스트)에서 첫 번째 쿼리의 결과 목록을 반환"""
+        rows = results_data.get(key)
+        if not rows or rows[0] is None:
+            return []
+        return rows[0]
+    
     async def _update_stats(self, result: Dict[str, Any]):
         """통계 정보를 업데이트합니다."""
         if not self.stats_enabled:
             return
             
         try:
-            if self.stats_file.exists():
-                with open(self.stats_file, 'r', encoding='utf-8') as f:
-                    stats = json.load(f)
-            else:
-                stats = {
-                    "total_queries": 0,
-                    "successful_queries": 0,
-                    "failed_queries": 0,
-                    "average_response_time": 0.0,
-                    "last_health_check": None,
-                    "health_status": "unknown",
-                    "created_at": datetime.now().isoformat()
-                }
-            
-            # 통계 업데이트
-            stats["total_queries"] = self.total_queries
-            stats["successful_queries"] = self.success_count
-            stats["failed_queries"] = self.failure_count
-            stats["average_response_time"] = self.response_time_avg
-            stats["last_health_check"] = self.last_health_check.isoformat() if self.last_health_check else None
-            stats["health_status"] = self.health_status
-            stats["updated_at"] = datetime.now().isoformat()
-            
-            # 최근 쿼리 기록 (최대 100개)
-            if "recent_queries" not in stats:
-                stats["recent_queries"] = []
-            
             recent_query = {
                 "query": result.get("query", ""),
                 "success": result.get("success", False),
@@ -460,20 +595,59 @@ class ExternalRAGService:
                 "timestamp": datetime.now().isoformat(),
                 "results_count": result.get("total_results", 0)
             }
+            self._recent_queries.append(recent_query)  # 최근 100개만 유지
+            self._stats_dirty = True
             
-            stats["recent_queries"].append(recent_query)
-            stats["recent_queries"] = stats["recent_queries"][-100:]  # 최근 100개만 유지
+            # 최근 쿼리는 JSONL에 한 줄 추가 (파일 전체를 읽고 다시 쓰지 않음)
+            line = _dumps_line(recent_query)
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._stats_executor, self._append_recent_query_sync, line)
             
-            # 파일 저장
-            with open(self.stats_file, 'w', encoding='utf-8') as f:
-                json.dump(stats, f, ensure_ascii=False, indent=2)
+            if time.monotonic() - self._last_stats_snapshot >= self._STATS_SNAPSHOT_INTERVAL:
+                await self._write_stats_snapshot()
                 
         except Exception as e:
             logger.error(f"외부 RAG 통계 업데이트 실패: {e}")
     
+    async def _write_stats_snapshot(self):
+        """현재 통계를 통계 파일에 저장하고 JSONL을 비웁니다."""
+        self._last_stats_snapshot = time.monotonic()
+        self._stats_dirty = False
+        stats = self._build_stats()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._stats_executor, self._write_stats_sync, stats)
+    
+    def _build_stats(self) -> Dict[str, Any]:
+        """메모리의 카운터와 최근 쿼리로 통계 딕셔너리 구성"""
+        return {
+            "total_queries": self.total_queries,
+            "successful_queries": self.success_count,
+            "failed_queries": self.failure_count,
+            "average_response_time": self.response_time_avg,
+            "last_health_check": self.last_health_check.isoformat() if self.last_health_check else None,
+            "health_status": self.health_status,
+            "created_at": self._stats_created_at,
+            "updated_at": datetime.now().isoformat(),
+            "recent_queries": list(self._recent_queries)
+        }
+    
+    def _append_recent_query_sync(self, line: bytes):
+        """최근 쿼리 한 줄을 JSONL에 추가 (통계 I/O 스레드에서 실행)"""
+        with open(self._recent_queries_log, 'ab') as f:
+            f.write(line)
+    
+    def _write_stats_sync(self, stats: Dict[str, Any]):
+        """통계 스냅숏을 임시 파일에 쓴 뒤 교체하고, 스냅숏에 포함된 JSONL 기록은 비움"""
+        temp_file = self.stats_file.with_suffix(".tmp")
+        with open(temp_file, 'wb') as f:
+            f.write(_dumps_stats(stats))
+        os.replace(temp_file, self.stats_file)
+        with open(self._recent_queries_log, 'wb'):
+            pass
+    
     def get_stats(self) -> Dict[str, Any]:
         """현재 통계 정보를 반환합니다."""
-        if not self.stats_enabled or not self.stats_file.exists():
+        if not self.stats_enabled:
             return {
                 "enabled": self.enabled,
                 "total_queries": self.total_queries,
@@ -484,19 +658,10 @@ class ExternalRAGService:
                 "last_health_check": self.last_health_check.isoformat() if self.last_health_check else None
             }
         
-        try:
-            with open(self.stats_file, 'r', encoding='utf-8') as f:
-                stats = json.load(f)
-            
-            stats["enabled"] = self.enabled
-            return stats
-            
-        except Exception as e:
-            logger.error(f"외부 RAG 통계 읽기 실패: {e}")
-            return {
-                "enabled": self.enabled,
-                "error": "통계 파일 읽기 실패"
-            }
+        # 스냅숏 파일은 최대 _STATS_SNAPSHOT_INTERVAL만큼 늦으므로 메모리의 최신 값을 반환
+        stats = self._build_stats()
+        stats["enabled"] = self.enabled
+        return stats
     
     def start_health_check(self):
         """헬스 체크 루프를 시작합니다."""
@@ -162,9 +162,9 @@ class MCPClientService:
                 # 방법 2: 직접 Ollama API 호출
                 try:
                     logger.info(f"[대화 주제 변경 감지] 직접 Ollama API 호출 방식 시도")
-                    import requests
+                    from src.utils.http_session import ollama_session
                     
-                    ollama_response = requests.post(
+                    ollama_response = ollama_session.post(
                         f"{settings.ollama_base_url}/api/generate",
                         json={
                             "model": target_model,
@@ -671,9 +671,9 @@ class MCPClientService:
                 # 방법 2: 직접 Ollama API 호출
                 try:
                     logger.info(f"[검색어 추출] 직접 Ollama API 호출 방식 시도")
-                    import requests
+                    from src.utils.http_session import ollama_session
                     
-                    ollama_response = requests.post(
+                    ollama_response = ollama_session.post(
                         f"{settings.ollama_base_url}/api/generate",
                         json={
                             "model": target_model,
@@ -1995,9 +1995,9 @@ class MCPClientService:
                 # 방법 2: 직접 Ollama API 호출
                 try:
                     logger.info(f"[MCP AI 결정] 🔄 직접 Ollama API 호출 방식 시도")
-                    import requests
+                    from src.utils.http_session import ollama_session
                     
-                    ollama_response = requests.post(
+                    ollama_response = ollama_session.post(
                         f"{settings.ollama_base_url}/api/generate",
                         json={
                             "model": target_model,
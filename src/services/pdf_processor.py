@@ -7,7 +7,7 @@ RAG 시스템에서 PDF 파일의 검색 효과를 높이기 위한 전처리 
 import os
 import logging
 import re
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator
 from pathlib import Path
 
 # PDF 처리 라이브러리
@@ -45,37 +45,52 @@ class PDFProcessor:
             logger.error(f"PDF 파일 처리 실패: {file_path}, 오류: {e}")
             raise
     
+    def iter_pdf_pages(self, file_path: str) -> Iterator[str]:
+        """
+        PDF를 페이지 단위로 전처리하여 하나씩 반환 (전체 텍스트를 메모리에 모으지 않음)
+        
+        Args:
+            file_path: PDF 파일 경로
+            
+        Yields:
+            str: "=== 페이지 N ===" 머리말이 붙은 전처리된 페이지 텍스트
+        """
+        try:
+            reader = PdfReader(file_path)
+        except Exception as e:
+            logger.error(f"PDF 처리 실패: {file_path}, 오류: {e}")
+            raise ValueError(f"PDF 파일을 처리할 수 없습니다: {e}")
+        
+        for page_num, page in enumerate(reader.pages):
+            try:
+                # 텍스트 추출
+                page_text = page.extract_text()
+                
+                if page_text:
+                    # 페이지별 전처리
+                    cleaned_text = self._preprocess_pdf_text(page_text)
+                    if cleaned_text:
+                        yield f"=== 페이지 {page_num + 1} ===\n{cleaned_text}"
+                
+            except Exception as e:
+                logger.warning(f"페이지 {page_num + 1} 처리 중 오류: {e}")
+                continue
+    
     def _extract_pdf_with_pypdf(self, file_path: str) -> str:
         """pypdf를 사용하여 PDF에서 텍스트 추출 및 전처리"""
         try:
-            reader = PdfReader(file_path)
-            text_content = []
-            
-            for page_num, page in enumerate(reader.pages):
-                try:
-                    # 텍스트 추출
-                    page_text = page.extract_text()
-                    
-                    if page_text:
-                        # 페이지별 전처리
-                        cleaned_text = self._preprocess_pdf_text(page_text)
-                        if cleaned_text:
-                            text_content.append(f"=== 페이지 {page_num + 1} ===\n{cleaned_text}")
-                    
-                except Exception as e:
-                    logger.warning(f"페이지 {page_num + 1} 처리 중 오류: {e}")
-                    continue
-            
             # 전체 텍스트 결합
-            full_text = '\n\n'.join(text_content)
+            full_text = '\n\n'.join(self.iter_pdf_pages(file_path))
             
             if not full_text.strip():
                 logger.warning(f"PDF에서 추출된 텍스트가 없습니다: {file_path}")
                 return ""
             
-            logger.info(f"PDF 텍스트 추출 완료: {file_path} (페이지 수: {len(reader.pages)})")
+            logger.info(f"PDF 텍스트 추출 완료: {file_path}")
             return full_text
             
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"PDF 처리 실패: {file_path}, 오류: {e}")
             raise ValueError(f"PDF 파일을 처리할 수 없습니다: {e}")
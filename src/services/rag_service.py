@@ -3,6 +3,7 @@ import logging
 import os
 from typing import Dict, Any, Optional, List, Tuple
 import asyncio
+import threading
 from pathlib import Path
 
 from langchain.prompts import PromptTemplate
@@ -10,7 +11,7 @@ from langchain.schema import Document
 from langchain_ollama import OllamaLLM
 
 from src.config.settings import settings
-from src.services.document_service import document_service
+from src.services.document_service import get_document_service
 from src.services.mcp_client_service import mcp_client_service
 from src.services.external_rag_service import ExternalRAGService
 
@@ -19,11 +20,16 @@ logger = logging.getLogger(__name__)
 class VectorStoreRetriever:
     """벡터 저장소 기반 검색기"""
     
-    def __init__(self, document_service, top_k: int = 5, similarity_threshold: float = 0.85):
-        self._document_service = document_service
+    def __init__(self, document_service_factory=get_document_service, top_k: int = 5, similarity_threshold: float = 0.85):
+        # 서비스 인스턴스 대신 팩토리를 보관해 첫 검색 시점에 DocumentService를 생성
+        self._document_service_factory = document_service_factory
         self._top_k = top_k
         self._similarity_threshold = similarity_threshold
     
+    @property
+    def _document_service(self):
+        return self._document_service_factory()
+    
     @property
     def top_k(self) -> int:
         return self._top_k
@@ -104,7 +110,6 @@ class RAGService:
         
         # LangChain 컴포넌트 초기화
         self.retriever = VectorStoreRetriever(
-            document_service=document_service,
             top_k=settings.default_top_k_documents,
             similarity_threshold=self.similarity_threshold
         )
@@ -112,12 +117,22 @@ class RAGService:
         # MCP 서비스 통합
         self.mcp_service = mcp_client_service
         
-        # RAG 디렉토리 초기화 및 문서 로드
-        self._initialize_rag_documents()
+        # RAG 디렉토리 문서 로드는 import 시점이 아니라 앱 시작 또는 첫 사용 시 수행
+        self._rag_documents_loaded = False
+        self._rag_documents_lock = threading.Lock()
         
         # 외부 RAG 서비스 초기화
         self.external_rag_service = ExternalRAGService(settings)
     
+    def ensure_rag_documents_loaded(self):
+        """RAG 디렉토리 문서를 아직 로드하지 않았다면 한 번만 로드합니다."""
+        if self._rag_documents_loaded:
+            return
+        with self._rag_documents_lock:
+            if not self._rag_documents_loaded:
+                self._initialize_rag_documents()
+                self._rag_documents_loaded = True
+    
     def _initialize_rag_documents(self):
         """RAG 디렉토리의 문서들을 벡터 저장소에 로드합니다."""
         try:
@@ -126,7 +141,7 @@ class RAGService:
                 return
             
             # 기존 문서 수 확인
-            existing_count = document_service.get_document_count()
+            existing_count = get_document_service().get_document_count()
             logger.info(f"기존 문서 수: {existing_count}")
             
             # RAG 디렉토리의 모든 파일 처리
@@ -140,8 +155,8 @@ class RAGService:
                         
                         logger.info(f"RAG 문서 처리 중: {file_path.name}")
                         
-                        # 문서 로드 및 처리
-                        content = document_service.load_document(str(file_path))
+                        # 문서를 페이지/시트 단위로 로드하며 바로 처리 (전체 텍스트를 모으지 않음)
+                        sections = get_document_service().load_document_stream(str(file_path))
                         
                         # 메타데이터 설정
                         metadata = {
@@ -152,8 +167,8 @@ class RAGService:
                         }
                         
                         # 벡터 저장소에 저장
-                        doc_id = document_service.process_document(
-                            content=content,
+                        doc_id = get_document_service().process_document_stream(
+                            sections,
                             filename=file_path.name,
                             metadata=metadata
                         )
@@ -164,7 +179,7 @@ class RAGService:
                         logger.error(f"RAG 문서 처리 실패 {file_path.name}: {e}")
             
             # 최종 문서 수 확인
-            final_count = document_service.get_document_count()
+            final_count = get_document_service().get_document_count()
             logger.info(f"RAG 초기화 완료 - 총 문서 수: {final_count}")
             
         except Exception as e:
@@ -174,7 +189,7 @@ class RAGService:
         """문서가 이미 처리되었는지 확인합니다."""
         try:
             # 벡터 저장소에서 해당 파일명으로 검색
-            search_results = document_service.search_documents(
+            search_results = get_document_service().search_documents(
                 query="", 
                 top_k=10, 
                 filter_metadata={"filename": filename}
@@ -199,8 +214,10 @@ class RAGService:
             Tuple[str, List[Dict]]: (컨텍스트 문자열, 검색 결과 리스트)
         """
         try:
+            self.ensure_rag_documents_loaded()
+            
             # 검색 결과 가져오기
-            search_results = document_service.search_documents(
+            search_results = get_document_service().search_documents(
                 query=query,
                 top_k=top_k
             )
@@ -442,9 +459,9 @@ class RAGService:
                         
                         # 방법 2: 직접 Ollama API 호출
                         try:
-                            import requests
+                            from src.utils.http_session import ollama_session
                             
-                            ollama_response = requests.post(
+                            ollama_response = ollama_session.post(
                                 f"{settings.ollama_base_url}/api/generate",
                                 json={
                                     "model": model_name or settings.default_model,
@@ -532,9 +549,9 @@ class RAGService:
                 # 방법 2: 직접 Ollama API 호출
                 try:
                     logger.info("직접 Ollama API로 응답 생성 시도...")
-                    import requests
+                    from src.utils.http_session import ollama_session
                     
-                    ollama_response = requests.post(
+                    ollama_response = ollama_session.post(
                         f"{settings.ollama_base_url}/api/generate",
                         json={
                             "model": model_name or settings.default_model,
@@ -683,9 +700,9 @@ class RAGService:
                             
                             # 방법 2: 직접 Ollama API 호출
                             try:
-                                import requests
+                                from src.utils.http_session import ollama_session
                                 
-                                ollama_response = requests.post(
+                                ollama_response = ollama_session.post(
                                     f"{settings.ollama_base_url}/api/generate",
                                     json={
                                         "model": model_name or settings.default_model,
@@ -839,11 +856,13 @@ class RAGService:
     def get_rag_status(self) -> Dict[str, Any]:
         """RAG 서비스의 상태를 반환합니다."""
         try:
+            self.ensure_rag_documents_loaded()
+            
             # 벡터 저장소 상태 확인
-            total_documents = document_service.get_document_count()
+            total_documents = get_document_service().get_document_count()
             
             # RAG 문서 수 확인
-            rag_documents = document_service.search_documents(
+            rag_documents = get_document_service().search_documents(
                 query="", 
                 top_k=1000, 
                 filter_metadata={"source": "rag"}
@@ -897,17 +916,19 @@ class RAGService:
             logger.info("RAG 문서 재로드 시작")
             
             # 기존 RAG 문서 삭제
-            existing_docs = document_service.get_all_documents()
-            rag_docs_to_delete = [doc["id"] for doc in existing_docs 
+            # 페이지 단위로 조회하며 삭제할 ID만 모음 (전체 문서 목록을 만들지 않음)
+            rag_docs_to_delete = [doc["id"] for doc in get_document_service().iter_all_documents()
                                 if doc.get("metadata", {}).get("source") == "rag"]
             
             for doc_id in rag_docs_to_delete:
-                document_service.delete_document(doc_id)
+                get_document_service().delete_document(doc_id)
             
             logger.info(f"기존 RAG 문서 {len(rag_docs_to_delete)}개 삭제 완료")
             
             # RAG 문서 재로드
-            self._initialize_rag_documents()
+            with self._rag_documents_lock:
+                self._initialize_rag_documents()
+                self._rag_documents_loaded = True
             
             # 상태 반환
             status = self.get_rag_status()
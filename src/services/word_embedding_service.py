@@ -23,7 +23,7 @@ except ImportError:
     logging.warning("KoNLPy가 설치되지 않았습니다. 기본 텍스트 처리만 사용합니다.")
 
 # 임베딩 및 벡터 DB
-from sentence_transformers import SentenceTransformer
+from src.utils.embedding_models import get_sentence_transformer
 import chromadb
 from chromadb.config import Settings
 
@@ -69,7 +69,7 @@ class WordEmbeddingService:
         self.vector_db_path = vector_db_path or settings.chroma_persist_directory
         
         # 임베딩 모델 초기화 (설정/인자 반영)
-        self.embedding_model = SentenceTransformer(self.embedding_model_name)
+        self.embedding_model = get_sentence_transformer(self.embedding_model_name)
         
         # 벡터 DB 초기화
         self._init_vector_db()
@@ -113,9 +113,8 @@ class WordEmbeddingService:
             return chromadb.HttpClient(
                 host=config["host"],
                 port=config["port"],
-                username=config["username"],
-                password=config["password"],
-                ssl=config["ssl"]
+                ssl=config["ssl"],
+                settings=chromadb.config.Settings(**config["settings"])
             )
         else:
             raise ValueError(f"지원하지 않는 Chroma DB 모드입니다: {config['mode']}")
@@ -0,0 +1,164 @@
+"""
+임베딩 모델 공유 유틸리티
+같은 이름의 SentenceTransformer 모델을 프로세스 안에서 한 번만 로드해 여러 서비스가 함께 사용합니다.
+"""
+
+import os
+import threading
+import logging
+from typing import Any, Dict
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 모델명 -> 로드된 SentenceTransformer 인스턴스
+_models: Dict[str, Any] = {}
+_models_lock = threading.Lock()
+
+# export_dynamic_quantized_onnx_model이 "avx512_vnni" 설정으로 저장하는 파일 경로
+_INT8_ONNX_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+
+def register_sentence_transformer(model_name: str, model: Any) -> None:
+    """이미 로드된 모델을 공유 목록에 등록합니다. (같은 이름이 있으면 기존 모델 유지)"""
+    with _models_lock:
+        _models.setdefault(model_name, model)
+
+
+def get_sentence_transformer(model_name: str, int8_onnx: bool = False, onnx: bool = False) -> Any:
+    """
+    공유 SentenceTransformer 모델을 반환합니다. 처음 요청 시에만 로드합니다.
+    
+    Args:
+        model_name: 임베딩 모델명
+        int8_onnx: True면 ONNX Runtime 동적 int8 양자화 모델을 사용 (실패 시 기본 모델)
+        onnx: True면 ONNX Runtime(FP32) 백엔드를 사용 (int8_onnx가 우선, 실패 시 기본 모델)
+    
+    Returns:
+        SentenceTransformer 인스턴스 (encode API는 동일)
+    """
+    if int8_onnx:
+        key, loader, label = f"{model_name}#qint8", _load_int8_onnx_model, "int8 ONNX"
+    elif onnx:
+        key, loader, label = f"{model_name}#onnx", _load_onnx_model, "ONNX"
+    else:
+        key, loader, label = model_name, None, None
+    model = _models.get(key)
+    if model is not None:
+        return model
+    with _models_lock:
+        # 락 대기 중에 다른 스레드가 로드했으면 그대로 사용
+        model = _models.get(key)
+        if model is None:
+            if loader is not None:
+                try:
+                    model = loader(model_name)
+                except Exception as e:
+                    # 실패한 변환을 매번 다시 시도하지 않도록 기본 모델을 같은 키로 등록
+                    logger.warning(f"{label} 모델 로드 실패, 기본 모델을 사용합니다: {e}")
+                    model = _models.get(model_name)
+                    if model is None:
+                        model = _models[model_name] = _load_torch_model(model_name)
+            else:
+                model = _load_torch_model(model_name)
+            _models[key] = model
+            logger.info(f"임베딩 모델 로드: {key}")
+        return model
+
+
+def _load_torch_model(model_name: str) -> Any:
+    """기본(torch) SentenceTransformer 모델 로드"""
+    from sentence_transformers import SentenceTransformer
+    from src.config.settings import settings
+
+    _configure_torch_threads(settings.torch_num_threads)
+    model = SentenceTransformer(model_name)
+    if settings.embedding_fp16 and model.device.type == "cuda":
+        # GPU 텐서 코어 FP16 연산 (CPU는 FP16 연산이 느려 FP32 유지), 결과는 저장 시 float32로 변환
+        model.half()
+    return model
+
+
+def _configure_torch_threads(num_threads: int) -> None:
+    """CPU 추론에 사용할 torch 스레드 수 지정 (0이면 torch 기본값 유지, 프로세스 전체에 적용)"""
+    if num_threads <= 0:
+        return
+    import torch
+
+    if torch.get_num_threads() != num_threads:
+        torch.set_num_threads(num_threads)
+        logger.info(f"torch 스레드 수 설정: {num_threads}")
+
+
+def _load_onnx_model(model_name: str) -> Any:
+    """ONNX Runtime 백엔드 SentenceTransformer 모델 로드 (ONNX 파일이 없으면 자동 변환, optimum[onnxruntime] 필요)"""
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model_name, backend="onnx")
+
+
+def _load_int8_onnx_model(model_name: str) -> Any:
+    """
+    ONNX 동적 int8 양자화 모델을 로드합니다.
+    양자화 파일이 없으면 처음 한 번 ONNX로 내보내고 양자화해 로컬 캐시에 저장합니다.
+    (optimum[onnxruntime] 필요)
+    """
+    from sentence_transformers import SentenceTransformer
+    from sentence_transformers.backend import export_dynamic_quantized_onnx_model
+    from src.config.settings import settings
+
+    local_path = os.path.join(settings.embedding_onnx_cache_dir, model_name.replace("/", "__"))
+    if not os.path.exists(os.path.join(local_path, _INT8_ONNX_FILE)):
+        logger.info(f"int8 ONNX 모델 생성 중: {model_name} -> {local_path}")
+        onnx_model = SentenceTransformer(model_name, backend="onnx")
+        onnx_model.save(local_path)
+        export_dynamic_quantized_onnx_model(onnx_model, "avx512_vnni", local_path)
+
+    return SentenceTransformer(local_path, backend="onnx", model_kwargs={"file_name": _INT8_ONNX_FILE})
+
+
+class StaticEmbeddingBackend:
+    """
+    model2vec StaticModel을 SentenceTransformer encode API로 감싼 정적 임베딩 백엔드
+    트랜스포머 추론 없이 토큰 벡터 조회 + 평균 풀링만 하므로 짧은 행 텍스트 대량 임베딩에 적합합니다.
+    (model2vec 필요, 벡터 공간/차원이 트랜스포머 모델과 다르므로 별도 컬렉션에 저장해야 함)
+    """
+
+    def __init__(self, model_name: str):
+        from model2vec import StaticModel
+
+        self.model_name = model_name
+        self._model = StaticModel.from_pretrained(model_name)
+        self._dimension = int(self._model.embedding.shape[1])
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self._dimension
+
+    def encode(self, sentences, batch_size: int = 1024, show_progress_bar: bool = False,
+               convert_to_numpy: bool = True, normalize_embeddings: bool = False, **kwargs) -> Any:
+        """SentenceTransformer.encode와 같은 형태로 (문장 수 x 차원) float32 배열 반환"""
+        single = isinstance(sentences, str)
+        embeddings = self._model.encode(
+            [sentences] if single else list(sentences),
+            batch_size=batch_size,
+            show_progress_bar=show_progress_bar
+        ).astype("float32", copy=False)
+        if normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings /= np.maximum(norms, 1e-12)
+        return embeddings[0] if single else embeddings
+
+
+def get_static_embedding_model(model_name: str) -> StaticEmbeddingBackend:
+    """공유 정적 임베딩(model2vec) 모델을 반환합니다. 처음 요청 시에만 로드합니다."""
+    key = f"{model_name}#static"
+    model = _models.get(key)
+    if model is not None:
+        return model
+    with _models_lock:
+        model = _models.get(key)
+        if model is None:
+            model = _models[key] = StaticEmbeddingBackend(model_name)
+            logger.info(f"임베딩 모델 로드: {key}")
+        return model
@@ -0,0 +1,13 @@
+"""
+공유 HTTP 세션 유틸리티
+동기 코드 경로에서 Ollama 서버 호출 시 keep-alive 연결을 재사용합니다.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Ollama 서버 호출용 공유 세션 (요청마다 TCP 연결을 새로 맺지 않음)
+ollama_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=0)
+ollama_session.mount("http://", _adapter)
+ollama_session.mount("https://", _adapter)
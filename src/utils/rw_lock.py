@@ -0,0 +1,54 @@
+"""
+읽기/쓰기 락 유틸리티
+여러 읽기 작업은 동시에 진행하고, 쓰기 작업은 단독으로 실행합니다.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class RWLock:
+    """다중 읽기 / 단일 쓰기 락 (쓰기 우선: 대기 중인 쓰기가 있으면 새 읽기는 기다림)
+
+    재진입을 지원하지 않으므로 락을 잡은 상태에서 같은 락을 다시 요청하지 않아야 합니다.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._reader_count = 0
+        self._writer_active = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def gen_rlock(self) -> Iterator[None]:
+        """읽기 락 (다른 읽기와 동시에 보유 가능)"""
+        with self._cond:
+            while self._writer_active or self._writers_waiting:
+                self._cond.wait()
+            self._reader_count += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._reader_count -= 1
+                if self._reader_count == 0:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def gen_wlock(self) -> Iterator[None]:
+        """쓰기 락 (모든 읽기/쓰기와 배타적)"""
+        with self._cond:
+            self._writers_waiting += 1
+            try:
+                while self._writer_active or self._reader_count:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer_active = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer_active = False
+                self._cond.notify_all()
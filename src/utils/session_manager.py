@@ -15,6 +15,9 @@ logger = logging.getLogger(__name__)
 # 전역 세션 저장소 (실제 운영에서는 Redis나 데이터베이스 사용 권장)
 sessions: Dict[str, SessionData] = {}
 
+# 세션별 응답용 메시지 dict 목록 (메시지 추가 시에만 갱신, 조회 시 그대로 반환)
+_message_payloads: Dict[str, List[Dict[str, Any]]] = {}
+
 def create_session_id() -> str:
     """새로운 세션 ID를 생성합니다."""
     return str(uuid.uuid4())
@@ -34,7 +37,8 @@ def get_or_create_session(session_id: Optional[str] = None) -> SessionData:
     
     if session_id not in sessions:
         current_time = datetime.now().isoformat()
-        sessions[session_id] = SessionData(
+        # 내부에서 만든 값이므로 검증 없이 생성 (기본값 필드는 model_construct가 채움)
+        sessions[session_id] = SessionData.model_construct(
             session_id=session_id,
             messages=[],
             created_at=current_time,
@@ -61,15 +65,25 @@ def add_message_to_session(
     """
     session = get_or_create_session(session_id)
     
-    message = Message(
+    timestamp = datetime.now().isoformat()
+    # 내부에서 만든 값이므로 검증 없이 생성
+    message = Message.model_construct(
         role=role,
         content=content,
-        timestamp=datetime.now().isoformat(),
+        timestamp=timestamp,
         model=model
     )
     
+    # 응답용 목록은 기존 메시지 기준으로 먼저 확보한 뒤 함께 추가
+    payload = get_session_messages(session_id)
     session.messages.append(message)
-    session.last_active = datetime.now().isoformat()
+    payload.append({
+        "role": role,
+        "content": content,
+        "timestamp": timestamp,
+        "model": model
+    })
+    session.last_active = timestamp
     
     logger.debug(f"세션 {session_id}에 메시지 추가: {role}")
 
@@ -85,6 +99,33 @@ def get_session(session_id: str) -> Optional[SessionData]:
     """
     return sessions.get(session_id)
 
+def get_session_messages(session_id: str) -> List[Dict[str, Any]]:
+    """
+    세션 메시지를 응답용 dict 목록으로 반환합니다.
+    
+    Args:
+        session_id: 세션 ID
+    
+    Returns:
+        List[Dict[str, Any]]: 메시지 목록 (role, content, timestamp, model)
+    """
+    payload = _message_payloads.get(session_id)
+    if payload is None:
+        session = sessions.get(session_id)
+        if session is None:
+            return []
+        payload = [
+            {
+                "role": msg.role,
+                "content": msg.content,
+                "timestamp": msg.timestamp,
+                "model": msg.model
+            }
+            for msg in session.messages
+        ]
+        _message_payloads[session_id] = payload
+    return payload
+
 def delete_session(session_id: str) -> bool:
     """
     세션을 삭제합니다.
@@ -97,6 +138,7 @@ def delete_session(session_id: str) -> bool:
     """
     if session_id in sessions:
         del sessions[session_id]
+        _message_payloads.pop(session_id, None)
         logger.info(f"세션 삭제: {session_id}")
         return True
     return False
@@ -117,7 +159,7 @@ def get_all_sessions() -> List[SessionInfo]:
             last_message = session_data.messages[-1]
             preview = last_message.content[:100] + "..." if len(last_message.content) > 100 else last_message.content
         
-        session_info = SessionInfo(
+        session_info = SessionInfo.model_construct(
             session_id=session_id,
             created_at=session_data.created_at,
             last_active=session_data.last_active,
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+문서 서비스 동시성/스트리밍 기능 테스트 스크립트
+(임베딩 모델이나 Chroma 서버 없이 가짜 임베딩과 메모리 컬렉션으로 실행)
+"""
+
+import os
+import sys
+import threading
+import types
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import chromadb
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+import src.services.document_service as document_service_module
+from src.services.document_service import DocumentService, _QueryEmbeddingBatcher
+from src.utils.rw_lock import RWLock
+
+
+class FakeEmbeddings:
+    """쿼리 문자열을 그대로 담은 벡터를 돌려주고 호출별 배치 크기를 기록하는 가짜 임베딩"""
+
+    def __init__(self):
+        self.batch_sizes = []
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts):
+        with self._lock:
+            self.batch_sizes.append(len(texts))
+        return [[float(len(text)), float(sum(map(ord, text)))] for text in texts]
+
+
+def test_query_embedding_batcher():
+    """동시 쿼리 배치: 배치 크기 상한과 호출자별 결과 확인"""
+    print("쿼리 임베딩 배처 테스트")
+    print("-" * 40)
+
+    embeddings = FakeEmbeddings()
+    batcher = _QueryEmbeddingBatcher(embeddings, max_batch=8, max_wait=0.05)
+    queries = [f"쿼리 {i}" * (i + 1) for i in range(20)]
+    results = {}
+    start = threading.Barrier(len(queries))
+
+    def worker(query):
+        start.wait()
+        results[query] = batcher.embed(query)
+
+    threads = [threading.Thread(target=worker, args=(query,)) for query in queries]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    print(f"배치 크기: {embeddings.batch_sizes}")
+    assert len(results) == len(queries)
+    assert sum(embeddings.batch_sizes) == len(queries)
+    assert max(embeddings.batch_sizes) <= 8
+    # 각 호출자는 다른 스레드의 벡터가 아니라 자신의 쿼리 벡터를 받아야 함
+    for query in queries:
+        assert results[query] == embeddings.embed_documents([query])[0]
+    print("통과")
+
+
+def create_stream_service():
+    """process_document_stream에 필요한 부분만 채운 DocumentService (모델/디스크 Chroma 없이 메모리 컬렉션 사용)"""
+    service = DocumentService.__new__(DocumentService)
+    service._rw = RWLock()
+    service._chunk_tokenizer = None
+    service._rust_splitter = None
+    service.text_splitter = RecursiveCharacterTextSplitter(chunk_size=60, chunk_overlap=20, length_function=len)
+    service._document_embeddings = FakeEmbeddings()
+    service._write_loop = None
+    service._search_cache = OrderedDict()
+    service._search_cache_lock = threading.Lock()
+    service._search_cache_generation = 0
+    collection = chromadb.EphemeralClient().get_or_create_collection(f"stream_test_{uuid.uuid4().hex}")
+    service.vectorstore = types.SimpleNamespace(_collection=collection)
+    return service
+
+
+def run_with_stream_settings(test_func):
+    """작은 배치 크기로 여러 번 나눠 쓰도록 하고 청크 정규화(병합)는 끈 설정으로 실행"""
+    original_settings = document_service_module.settings
+    document_service_module.settings = original_settings.model_copy(
+        update={"chunk_regularize": False, "chroma_batch_size": 2}
+    )
+    try:
+        test_func()
+    finally:
+        document_service_module.settings = original_settings
+
+
+def sheet_section(name: str, word_count: int) -> str:
+    return " ".join(f"{name}w{i}" for i in range(word_count))
+
+
+def test_stream_keeps_overlap_across_sections():
+    """구간 스트리밍 저장: 마지막 청크가 다음 구간과 이어져 경계에서도 겹침 유지"""
+    print("\n구간 경계 겹침 테스트")
+    print("-" * 40)
+
+    def check():
+        service = create_stream_service()
+        sections = [sheet_section("s0", 13), sheet_section("s1", 4), sheet_section("s2", 20)]
+        doc_id = service.process_document_stream(iter(sections), filename="sheets.xlsx")
+
+        stored = service.vectorstore._collection.get(where={"doc_id": doc_id})
+        chunks = [text for _, text in sorted(
+            zip((m["chunk_index"] for m in stored["metadatas"]), stored["documents"])
+        )]
+        for chunk in chunks:
+            print(repr(chunk))
+
+        # chunk_index는 배치가 나뉘어도 0부터 끊김 없이 이어짐
+        assert sorted(m["chunk_index"] for m in stored["metadatas"]) == list(range(len(chunks)))
+        # 첫 구간의 마지막 청크는 다음 구간과 이어 붙여 분할되므로 경계를 넘는 청크가 생기고,
+        # 그 청크도 앞 청크와 겹치는 단어로 시작함
+        boundary_index = next(i for i, chunk in enumerate(chunks) if "s0w12" in chunk)
+        boundary = chunks[boundary_index]
+        assert "s1w0" in boundary
+        assert boundary_index > 0 and boundary.split()[0] in chunks[boundary_index - 1].split()
+        # 모든 구간의 모든 단어가 저장됨
+        stored_words = set(" ".join(chunks).split())
+        assert all(set(section.split()) <= stored_words for section in sections)
+
+    run_with_stream_settings(check)
+    print("통과")
+
+
+def test_stream_rolls_back_on_error():
+    """구간 처리 중 오류가 나면 이미 저장한 같은 doc_id의 청크를 삭제"""
+    print("\n스트리밍 오류 롤백 테스트")
+    print("-" * 40)
+
+    def check():
+        service = create_stream_service()
+        collection = service.vectorstore._collection
+        written_before_error = []
+
+        def sections():
+            yield sheet_section("a", 40)
+            yield sheet_section("b", 40)
+            written_before_error.append(collection.count())
+            raise RuntimeError("시트 읽기 실패")
+
+        try:
+            service.process_document_stream(sections(), filename="broken.xlsx")
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("오류가 호출자에게 전달되어야 합니다")
+
+        print(f"오류 전 저장된 청크 수: {written_before_error[0]}, 롤백 후: {collection.count()}")
+        assert written_before_error[0] > 0
+        assert collection.count() == 0
+
+    run_with_stream_settings(check)
+    print("통과")
+
+
+def main():
+    """메인 테스트 함수"""
+    print("문서 서비스 테스트 시작")
+    print("=" * 60)
+
+    test_query_embedding_batcher()
+    test_stream_keeps_overlap_across_sections()
+    test_stream_rolls_back_on_error()
+
+    print("\n" + "=" * 60)
+    print("테스트 완료!")
+
+
+if __name__ == "__main__":
+    main()
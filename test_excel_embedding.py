@@ -90,7 +90,7 @@ def test_excel_embedding_service():
             print(f"    ✗ 텍스트 추출 실패: {e}")
             return False
         
-        # 4. 전처리 테스트
+        # 4. 전처리 테스트 (split_excel_document는 행마다 전처리하므로 여기서는 결과 확인용)
         print("  4. 전처리 테스트")
         try:
             processed_text = service.preprocess_text(extracted_text)
@@ -104,7 +104,7 @@ def test_excel_embedding_service():
         print("  5. 문서 분할 테스트")
         try:
             metadata = {'file_name': 'test_employee_data.xlsx', 'file_type': 'excel'}
-            chunks = service.split_excel_document(processed_text, metadata)
+            chunks = service.split_excel_document(extracted_text, metadata)
             print(f"    ✓ 문서 분할 완료: {len(chunks)}개 청크")
             
             # 청크 정보 출력
@@ -119,7 +119,7 @@ def test_excel_embedding_service():
         try:
             embeddings = service.create_embeddings(chunks)
             print(f"    ✓ 임베딩 생성 완료: {len(embeddings)}개 벡터")
-            print(f"    벡터 차원: {len(embeddings[0]) if embeddings else 0}")
+            print(f"    벡터 차원: {embeddings.shape[1] if len(embeddings) else 0}")
         except Exception as e:
             print(f"    ✗ 임베딩 생성 실패: {e}")
             return False
@@ -163,6 +163,60 @@ def test_excel_embedding_service():
         return False
 
 
+class FakeOkt:
+    """공백 단위로 나눠 모두 명사로 태깅하는 가짜 Okt (호출 횟수 기록)"""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def pos(self, text, norm=False, stem=False):
+        self.calls += 1
+        return [(word, 'Punctuation' if word == '¶' else 'Noun') for word in text.split()]
+
+
+def test_split_excel_document_sheets():
+    """2개 시트 문서 분할: 시트 이름 태깅, 내용 기반 청크 ID 안정성, 시트 단위 형태소 분석 묶음 확인"""
+    print("  엑셀 문서 분할 테스트 시작")
+    
+    test_file_path = create_test_excel_document()
+    assert test_file_path, "테스트 문서 생성 실패"
+    
+    # 모델/벡터 DB 없이 분할에 필요한 속성만 설정 (테스트 행은 모두 짧아 토크나이저를 사용하지 않음)
+    service = ExcelEmbeddingService.__new__(ExcelEmbeddingService)
+    service.chunk_size = 300
+    service.chunk_overlap = 50
+    service.tokenizer = None
+    service._init_korean_analyzers()
+    service._active_analyzer, service._analyzer_resolved = None, True
+    
+    extracted_text = service.extract_text_from_excel(test_file_path)
+    metadata = {'file_name': 'test_employee_data.xlsx', 'file_type': 'excel'}
+    chunks = service.split_excel_document(extracted_text, metadata)
+    
+    # 각 행은 자기 시트 이름으로 태깅됨
+    assert {chunk.sheet_name for chunk in chunks} == {'직원정보', '부서통계'}
+    employee_chunks = [chunk for chunk in chunks if '김철수' in chunk.content]
+    stats_chunks = [chunk for chunk in chunks if '평균나이' in chunk.content]
+    assert employee_chunks and all(chunk.sheet_name == '직원정보' for chunk in employee_chunks)
+    assert stats_chunks and all(chunk.sheet_name == '부서통계' for chunk in stats_chunks)
+    
+    # 청크 ID는 파일 이름 + 내용 해시이므로 유일하고, 다시 분할해도 같음
+    chunk_ids = [chunk.chunk_id for chunk in chunks]
+    assert len(set(chunk_ids)) == len(chunk_ids)
+    assert all(chunk_id.startswith('test_employee_data.xlsx_') for chunk_id in chunk_ids)
+    assert [chunk.chunk_id for chunk in service.split_excel_document(extracted_text, metadata)] == chunk_ids
+    print(f"    ✓ {len(chunks)}개 청크, 시트 태깅/청크 ID 확인")
+    
+    # 형태소 분석기는 행마다가 아니라 시트마다 한 번 호출되고, 결과는 행별 전처리와 같음
+    analyzer = FakeOkt()
+    service._active_analyzer = ('okt', analyzer)
+    analyzed_chunks = service.split_excel_document(extracted_text, metadata)
+    assert analyzer.calls == 2, analyzer.calls
+    assert [chunk.content for chunk in analyzed_chunks] == [chunk.content for chunk in chunks]
+    assert [chunk.chunk_id for chunk in analyzed_chunks] == chunk_ids
+    print("    ✓ 시트별 형태소 분석 묶음 확인")
+
+
 def test_api_endpoints():
     """API 엔드포인트 테스트"""
     try:
@@ -233,6 +287,16 @@ def main():
     print("엑셀 임베딩 기능 테스트 시작")
     print("=" * 50)
     
+    # 문서 분할 테스트 (모델 없이 실행)
+    try:
+        test_split_excel_document_sheets()
+        split_test_success = True
+    except AssertionError as e:
+        print(f"  ✗ 엑셀 문서 분할 테스트 실패: {e}")
+        split_test_success = False
+    
+    print("\n" + "=" * 50)
+    
     # 서비스 테스트
     service_test_success = test_excel_embedding_service()
     
@@ -243,10 +307,11 @@ def main():
     
     print("\n" + "=" * 50)
     print("테스트 결과 요약:")
+    print(f"  문서 분할 테스트: {'성공' if split_test_success else '실패'}")
     print(f"  서비스 테스트: {'성공' if service_test_success else '실패'}")
     print(f"  API 테스트: {'성공' if api_test_success else '실패'}")
     
-    if service_test_success and api_test_success:
+    if split_test_success and service_test_success and api_test_success:
         print("  전체 테스트: 성공 ✓")
         return True
     else:
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+읽기/쓰기 락 테스트 스크립트
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.rw_lock import RWLock
+
+
+def test_readers_share_lock():
+    """여러 읽기는 동시에 락을 보유할 수 있음"""
+    print("동시 읽기 테스트")
+    print("-" * 40)
+
+    lock = RWLock()
+    both_inside = threading.Barrier(2, timeout=2)
+
+    def reader():
+        with lock.gen_rlock():
+            both_inside.wait()  # 두 읽기가 동시에 들어오지 못하면 BrokenBarrierError
+
+    threads = [threading.Thread(target=reader) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert not both_inside.broken
+    print("통과")
+
+
+def test_waiting_writer_blocks_new_readers():
+    """쓰기 우선: 대기 중인 쓰기가 있으면 새 읽기는 쓰기가 끝날 때까지 기다림"""
+    print("\n쓰기 우선 테스트")
+    print("-" * 40)
+
+    lock = RWLock()
+    events = []
+    events_lock = threading.Lock()
+    first_reader_in = threading.Event()
+    release_first_reader = threading.Event()
+
+    def record(name):
+        with events_lock:
+            events.append(name)
+
+    def first_reader():
+        with lock.gen_rlock():
+            first_reader_in.set()
+            release_first_reader.wait(timeout=5)
+            record("reader1 release")
+
+    def writer():
+        with lock.gen_wlock():
+            record("writer")
+
+    def second_reader():
+        with lock.gen_rlock():
+            record("reader2")
+
+    reader1_thread = threading.Thread(target=first_reader)
+    reader1_thread.start()
+    first_reader_in.wait(timeout=5)
+
+    writer_thread = threading.Thread(target=writer)
+    writer_thread.start()
+    # 쓰기가 대기열에 올라갈 때까지 기다림
+    deadline = time.monotonic() + 5
+    while lock._writers_waiting == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert lock._writers_waiting == 1
+
+    reader2_thread = threading.Thread(target=second_reader)
+    reader2_thread.start()
+    time.sleep(0.1)
+    # 첫 읽기가 락을 보유 중이지만 쓰기가 대기 중이므로 두 번째 읽기는 들어오지 못함
+    assert events == []
+
+    release_first_reader.set()
+    for thread in (reader1_thread, writer_thread, reader2_thread):
+        thread.join(timeout=5)
+
+    print(f"실행 순서: {events}")
+    assert events == ["reader1 release", "writer", "reader2"]
+    print("통과")
+
+
+def main():
+    """메인 테스트 함수"""
+    print("읽기/쓰기 락 테스트 시작")
+    print("=" * 60)
+
+    test_readers_share_lock()
+    test_waiting_writer_blocks_new_readers()
+
+    print("\n" + "=" * 60)
+    print("테스트 완료!")
+
+
+if __name__ == "__main__":
+    main()